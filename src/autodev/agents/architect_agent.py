@@ -1,20 +1,145 @@
 """Architect Agent for generating technical design documents."""
 
 import re
-from typing import Any, Dict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import orjson
+from pydantic import BaseModel, Field
 
 from ..core.state import AgentState
-from ..agents.base import LLMAgent
+from ..core.task_table import TaskTable
+from ..agents.base import LLMAgent, record_write_errors
 from ..config.settings import get_settings
 from ..config.prompts import ARCHITECT_SYSTEM_PROMPT, get_architect_prompt
-from ..tools.file_ops import write_file, parse_markdown_code_blocks, write_tasks_json
-from ..tools.validation import OutputValidator, validate_design, validate_tasks, validate_tasks_json, validate_json_output
+from ..tools.file_ops import wait_for_pending_writes, write_file, write_tasks_json
+from ..tools.validation import OutputValidator, detect_task_cycles, validate_design, validate_tasks, validate_tasks_json, validate_json_output
 from ..utils.logger import get_logger
 from ..utils.helpers import generate_session_id, extract_code_blocks
 
 
 logger = get_logger()
 
+_BANNER = "=" * 60
+
+# Patterns used to pull the task list out of architect responses
+_TASKS_REF_RE = re.compile(r'tasks\.json[:\s]*```(?:json)?\s*\n(.*?)```', re.DOTALL | re.IGNORECASE)
+_TASK_MD_RE = re.compile(r'[-*]\s+\*\*Task\s+(\d+)[:\s]*\*\*(.+?)(?=\n[-*]|\Z|\n\n|\Z)', re.DOTALL)
+
+
+class ArchitectTask(BaseModel):
+    """A single implementation task in structured architect output."""
+
+    id: str
+    title: str
+    description: str
+    dependencies: List[str] = Field(default_factory=list)
+    status: str = "pending"
+    priority: int = 5
+
+
+class ArchitectOutput(BaseModel):
+    """Structured architect output: the design document plus its task list."""
+
+    design: str = Field(description="Complete technical design document in markdown")
+    tasks: List[ArchitectTask] = Field(description="Atomic implementation tasks (the tasks.json content)")
+
+
+def _find_json_array(text: str) -> str | None:
+    """Find the first balanced JSON array of objects (``[{...}, ...]``) in text.
+
+    Walks the text once, tracking bracket nesting and JSON strings, so
+    malformed LLM output cannot trigger regex backtracking.
+
+    Args:
+        text: Text to scan
+
+    Returns:
+        The array source text, or None if no balanced array is found
+    """
+    stack: list[tuple[str, int, bool]] = []  # (opening char, position, is array of objects)
+    in_string = False
+    escaped = False
+    length = len(text)
+
+    for pos, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+
+        if char == '"' and stack:
+            in_string = True
+        elif char == "[" or char == "{":
+            is_candidate = False
+            if char == "[":
+                nxt = pos + 1
+                while nxt < length and text[nxt].isspace():
+                    nxt += 1
+                is_candidate = nxt < length and text[nxt] == "{"
+            stack.append((char, pos, is_candidate))
+        elif char == "]" or char == "}":
+            expected = "[" if char == "]" else "{"
+            if not stack or stack[-1][0] != expected:
+                # Unbalanced input: drop what we have and keep scanning
+                stack.clear()
+                continue
+            _, start, is_candidate = stack.pop()
+            if is_candidate and not any(entry[2] for entry in stack):
+                return text[start:pos + 1]
+
+    return None
+
+
+def _extract_design_and_json(response: str) -> tuple[str, str | None]:
+    """Split a response into design text and the first ```json fenced block.
+
+    Streams over the lines once, tracking fence state: lines inside ```json
+    fences are removed from the design, and the first such block is kept
+    as the JSON payload. Other fenced blocks stay in the design untouched.
+
+    Args:
+        response: Full LLM response
+
+    Returns:
+        Tuple of (design_content, json_content or None if no json block)
+    """
+    design_buf: list[str] = []
+    block_buf: list[str] = []
+    tasks_json: str | None = None
+    fence_lang: str | None = None  # None when outside a fence
+
+    for line in response.splitlines(keepends=True):
+        stripped = line.strip()
+        if fence_lang is None:
+            if stripped.startswith("```"):
+                fence_lang = stripped[3:].strip().lower()
+                if fence_lang == "json":
+                    block_buf = [line]
+                    continue
+            design_buf.append(line)
+        elif stripped == "```":
+            if fence_lang == "json":
+                if tasks_json is None:
+                    tasks_json = "".join(block_buf[1:])
+            else:
+                design_buf.append(line)
+            fence_lang = None
+        elif fence_lang == "json":
+            block_buf.append(line)
+        else:
+            design_buf.append(line)
+
+    if fence_lang == "json":
+        # Unterminated json fence: leave it in the design as-is
+        design_buf.extend(block_buf)
+
+    return "".join(design_buf), tasks_json
+
 
 class ArchitectAgent(LLMAgent):
     """Architect Agent responsible for technical design.
@@ -32,13 +157,49 @@ class ArchitectAgent(LLMAgent):
         super().__init__(
             name="Architect_Agent",
             model_config=settings.architect_model,
-            system_prompt=ARCHITECT_SYSTEM_PROMPT
+            system_prompt=ARCHITECT_SYSTEM_PROMPT,
+            settings=settings
         )
 
     def _get_default_system_prompt(self) -> str:
         """Get the default system prompt for Architect agent."""
         return ARCHITECT_SYSTEM_PROMPT
 
+    def execute(self, state: AgentState) -> Dict[str, Any]:
+        """Execute the agent, using schema-constrained output when enabled.
+
+        With ``architect_structured_output`` on, the model is asked for an
+        ``ArchitectOutput`` object directly, so no text splitting or JSON
+        recovery is needed. Any failure falls back to the free-form path.
+
+        Args:
+            state: Current agent state
+
+        Returns:
+            Dictionary of state updates
+        """
+        if not self.settings.agent.architect_structured_output:
+            return super().execute(state)
+
+        logger.info(f"[{self.name}] Executing agent (structured output)")
+        try:
+            prompt = self._build_prompt(state)
+            structured_llm = self.llm.with_structured_output(ArchitectOutput)
+            output = structured_llm.invoke(self._build_messages(prompt))
+        except Exception as e:
+            logger.warning(f"[{self.name}] Structured output failed, falling back to free-form: {e}")
+            return super().execute(state)
+
+        tasks = [task.model_dump() for task in output.tasks]
+        is_valid, errors = validate_tasks(tasks)
+        if not is_valid:
+            logger.warning(f"Tasks validation failed: {errors}")
+
+        updates = self._save_artifacts(output.design, tasks, state)
+        self.add_message(state, "Completed successfully")
+        logger.info(f"[{self.name}] Execution completed")
+        return updates
+
     def _build_prompt(self, state: AgentState) -> str:
         """Build the prompt for design generation.
 
@@ -58,11 +219,18 @@ class ArchitectAgent(LLMAgent):
         if prd_path:
             try:
                 from ..tools.file_ops import read_file
+                wait_for_pending_writes()
                 prd_content = read_file(prd_path)
                 logger.info(f"Read PRD content from {prd_path} ({len(prd_content)} chars)")
             except Exception as e:
                 logger.warning(f"Could not read PRD file {prd_path}: {e}")
 
+        # The PM keeps the PRD in state too, so a failed write does not leave
+        # the architect designing from an empty PRD
+        if not prd_content and state.get("prd_content"):
+            prd_content = state["prd_content"]
+            logger.info(f"Using PRD content from state ({len(prd_content)} chars)")
+
         prompt = get_architect_prompt(prd_path, prd_content)
 
         if feedback:
@@ -105,27 +273,57 @@ class ArchitectAgent(LLMAgent):
             # Try to extract tasks from response
             tasks = self._extract_tasks_flexible(response)
 
-        # Save artifacts to workspace
-        session_id = state.get("session_id", generate_session_id())
-        settings = get_settings()
-        workspace = settings.get_session_workspace(session_id)
+        return self._save_artifacts(design_content, tasks, state)
+
+    def _save_artifacts(
+        self,
+        design_content: str,
+        tasks: list[dict] | None,
+        state: AgentState
+    ) -> Dict[str, Any]:
+        """Write Design.md and tasks.json and build the state updates.
+
+        Args:
+            design_content: Design document content
+            tasks: Parsed task list, or None
+            state: Current agent state
 
-        # Save design document
+        Returns:
+            Dictionary of state updates
+        """
+        # Save artifacts to workspace
+        session_id = state.get("session_id") or generate_session_id()
+        workspace = self.settings.get_session_workspace(session_id)
+
+        # Catch circular dependencies once, before any coding task is spawned.
+        # Only a well-formed list can be reordered; a malformed one is kept as
+        # is and still saved, and the tasks.json write reports its errors
+        well_formed = bool(tasks) and all(isinstance(t, dict) and "id" in t for t in tasks)
+        cycle = detect_task_cycles(tasks or [])
+        if well_formed and not cycle:
+            # Store tasks in dependency order, so the coder can walk
+            # current_task_index forward without searching for a ready task
+            tasks = [tasks[i] for i in TaskTable(tasks).topological_order()]
+
+        # Save design document and tasks.json; a failure is recorded in the
+        # error field and the design stays in state
+        write_errors: List[str] = []
         design_path = workspace / "Design.md"
         try:
             write_file(design_path, design_content)
-            logger.info(f"Design saved to: {design_path}")
+            logger.info(f"Saved: {design_path}")
         except Exception as e:
-            logger.error(f"Failed to save design: {e}")
+            write_errors.append(f"Failed to write {design_path}: {e}")
 
-        # Save tasks.json
         tasks_path = workspace / "tasks.json"
         if tasks:
             try:
                 write_tasks_json(tasks_path, tasks)
-                logger.info(f"Tasks saved to: {tasks_path}")
             except Exception as e:
-                logger.error(f"Failed to save tasks: {e}")
+                write_errors.append(f"Failed to write {tasks_path}: {e}")
+
+        for message in write_errors:
+            logger.error(message)
 
         # Update state
         updates = {
@@ -135,8 +333,16 @@ class ArchitectAgent(LLMAgent):
             "current_task_index": 0,
             "stage": "design",
             "design_iteration": state.get("design_iteration", 0) + 1,
+            # Carried in state so routing does not walk the task graph again
+            "task_cycle": cycle or [],
         }
 
+        if cycle:
+            error_msg = f"Circular task dependencies: {' -> '.join(cycle)}"
+            logger.error(error_msg)
+            updates["error"] = error_msg
+        record_write_errors(updates, write_errors)
+
         # Clear feedback after processing
         if state.get("design_feedback"):
             updates["design_feedback"] = ""
@@ -152,20 +358,16 @@ class ArchitectAgent(LLMAgent):
         Returns:
             Tuple of (design_content, tasks_json_string)
         """
-        # Look for JSON code block
-        json_blocks = parse_markdown_code_blocks(response, "json")
-
-        if json_blocks:
-            # Extract the JSON block
-            tasks_json = json_blocks[0][1]  # (language, content) tuple
-            # Remove the JSON block from the response
-            design_content = re.sub(r'```json\n.*?\n```', '', response, flags=re.DOTALL)
+        # Look for JSON code block (single pass: strips json fences from the
+        # design and captures the first one as the tasks payload)
+        design_content, tasks_json = _extract_design_and_json(response)
+        if tasks_json is not None:
             return design_content.strip(), tasks_json
 
         # Look for tasks.json reference
         if "tasks.json" in response.lower():
             # Try to find JSON content after "tasks.json"
-            match = re.search(r'tasks\.json[:\s]*```(?:json)?\s*\n(.*?)```', response, re.DOTALL | re.IGNORECASE)
+            match = _TASKS_REF_RE.search(response)
             if match:
                 tasks_json = match.group(1).strip()
                 design_content = response[:match.start()].strip()
@@ -183,23 +385,20 @@ class ArchitectAgent(LLMAgent):
         Returns:
             List of task dictionaries or None
         """
-        import json
-
         # Method 1: Look for JSON array
-        json_match = re.search(r'\[\s*\{.*?\}\s*\]', response, re.DOTALL)
-        if json_match:
+        json_array = _find_json_array(response)
+        if json_array:
             try:
-                tasks = json.loads(json_match.group(0))
+                tasks = orjson.loads(json_array)
                 if isinstance(tasks, list) and len(tasks) > 0:
                     if "id" in tasks[0]:
                         return tasks
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 pass
 
         # Method 2: Parse markdown list into tasks
         tasks = []
-        task_pattern = r'[-*]\s+\*\*Task\s+(\d+)[:\s]*\*\*(.+?)(?=\n[-*]|\Z|\n\n|\Z)'
-        matches = re.findall(task_pattern, response, re.DOTALL)
+        matches = _TASK_MD_RE.findall(response)
 
         for i, (num, content) in enumerate(matches):
             task_id = f"task_{int(num):03d}"
@@ -243,6 +442,30 @@ class ArchitectAgent(LLMAgent):
         ]
 
 
+# Global architect agent instance, reused across graph ticks
+_architect_agent: Optional[ArchitectAgent] = None
+
+
+def get_architect_agent() -> ArchitectAgent:
+    """Get or create the global architect agent.
+
+    The agent is rebuilt when the global settings have been replaced.
+
+    Returns:
+        ArchitectAgent instance
+    """
+    global _architect_agent
+    if _architect_agent is None or _architect_agent.settings is not get_settings():
+        _architect_agent = ArchitectAgent()
+    return _architect_agent
+
+
+def reset_architect_agent() -> None:
+    """Reset the global architect agent instance (useful for testing)."""
+    global _architect_agent
+    _architect_agent = None
+
+
 def architect_agent_node(state: AgentState) -> Dict[str, Any]:
     """LangGraph node function for the Architect agent.
 
@@ -254,12 +477,13 @@ def architect_agent_node(state: AgentState) -> Dict[str, Any]:
     Returns:
         Dictionary of state updates
     """
-    logger.info("=" * 60)
-    logger.info("Architect Agent Node Invoked")
-    logger.info("=" * 60)
+    logger.info("%s\nArchitect Agent Node Invoked\n%s", _BANNER, _BANNER)
 
-    agent = ArchitectAgent()
-    return agent.execute(state)
+    # Surface PRD writes from the PM node that failed in the background
+    write_errors = wait_for_pending_writes()
+
+    agent = get_architect_agent()
+    return record_write_errors(agent.execute(state), write_errors)
 
 
 def architect_revision_node(state: AgentState) -> Dict[str, Any]:
@@ -271,9 +495,7 @@ def architect_revision_node(state: AgentState) -> Dict[str, Any]:
     Returns:
         Dictionary of state updates
     """
-    logger.info("=" * 60)
-    logger.info("Architect Revision Node Invoked")
-    logger.info("=" * 60)
+    logger.info("%s\nArchitect Revision Node Invoked\n%s", _BANNER, _BANNER)
 
     # Check if there's feedback to process
     feedback = state.get("design_feedback", "")
@@ -281,8 +503,33 @@ def architect_revision_node(state: AgentState) -> Dict[str, Any]:
         logger.info("No design feedback, skipping revision")
         return {}
 
-    agent = ArchitectAgent()
-    return agent.execute(state)
+    write_errors = wait_for_pending_writes()
+
+    agent = get_architect_agent()
+    return record_write_errors(agent.execute(state), write_errors)
+
+
+def check_task_dependencies(state: AgentState) -> str:
+    """Conditional edge function to stop before coding if it cannot proceed.
+
+    Coding is skipped when the architect recorded a ``task_cycle`` or when
+    Design.md was never written, since every coding task reads the design
+    from disk.
+
+    Args:
+        state: Current agent state
+
+    Returns:
+        Next edge: "valid", "has_cycle" or "write_failed"
+    """
+    if state.get("task_cycle"):
+        logger.error("Task list has circular dependencies, skipping coding phase")
+        return "has_cycle"
+    design_path = state.get("design_file_path")
+    if design_path and not Path(design_path).exists():
+        logger.error(f"Design document {design_path} was not written, skipping coding phase")
+        return "write_failed"
+    return "valid"
 
 
 def validate_design_node(state: AgentState) -> Dict[str, Any]:
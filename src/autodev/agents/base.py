@@ -1,19 +1,148 @@
 """Base agent class for all agents in the multi-agent system."""
 
+import asyncio
+import hashlib
+import threading
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
-from langchain_anthropic import ChatAnthropic
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
 
 from ..core.state import AgentState
-from ..config.settings import get_settings, ModelConfig
+from ..config.settings import get_settings, ModelConfig, Settings
 from ..utils.logger import get_logger
-from ..utils.helpers import truncate_text
+
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel
 
 
 logger = get_logger()
 
+# langchain_anthropic pulls in the whole Anthropic SDK (seconds of import time),
+# so it is imported when the first client is built rather than at module load
+ChatAnthropic: Any = None
+
+
+def _chat_anthropic_class() -> Any:
+    """Import ChatAnthropic on first use.
+
+    Returns:
+        The ChatAnthropic class
+    """
+    global ChatAnthropic
+    if ChatAnthropic is None:
+        from langchain_anthropic import ChatAnthropic as chat_anthropic
+        ChatAnthropic = chat_anthropic
+    return ChatAnthropic
+
+
+# Shared LLM clients, keyed by model/connection settings
+_llm_clients: Dict[Tuple[Any, ...], "BaseChatModel"] = {}
+
+
+def get_llm_client(model_config: ModelConfig, api_key: str) -> "BaseChatModel":
+    """Get or create a ChatAnthropic client for a model configuration.
+
+    Agents with the same configuration share one client and therefore one
+    HTTP connection pool, so keep-alive connections survive across agent
+    instances and graph ticks.
+
+    Args:
+        model_config: Model configuration
+        api_key: Anthropic API key
+
+    Returns:
+        ChatAnthropic instance
+    """
+    key = (
+        model_config.model,
+        model_config.temperature,
+        model_config.max_tokens,
+        model_config.timeout,
+        model_config.base_url,
+        api_key,
+    )
+    client = _llm_clients.get(key)
+    if client is None:
+        # Build kwargs for ChatAnthropic
+        kwargs = {
+            "model": model_config.model,
+            "temperature": model_config.temperature,
+            "max_tokens": model_config.max_tokens,
+            "timeout": model_config.timeout,
+            "api_key": api_key,
+        }
+
+        # Add base_url if configured
+        if model_config.base_url:
+            kwargs["base_url"] = model_config.base_url
+
+        client = _llm_clients.setdefault(key, _chat_anthropic_class()(**kwargs))
+    return client
+
+
+def reset_llm_clients() -> None:
+    """Drop all shared LLM clients (useful for testing)."""
+    _llm_clients.clear()
+
+
+# Recent LLM responses keyed by a hash of the full request, most recent last
+_response_cache: "OrderedDict[str, str]" = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+
+def get_cached_response(key: str) -> Optional[str]:
+    """Look up a cached LLM response and mark it as recently used.
+
+    Args:
+        key: Request hash
+
+    Returns:
+        Cached response text or None
+    """
+    with _response_cache_lock:
+        response = _response_cache.get(key)
+        if response is not None:
+            _response_cache.move_to_end(key)
+        return response
+
+
+def cache_response(key: str, response: str, max_size: int) -> None:
+    """Store an LLM response, evicting the least recently used beyond max_size.
+
+    Args:
+        key: Request hash
+        response: Response text
+        max_size: Maximum number of cached responses
+    """
+    with _response_cache_lock:
+        _response_cache[key] = response
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > max_size:
+            _response_cache.popitem(last=False)
+
+
+def reset_response_cache() -> None:
+    """Drop all cached LLM responses (useful for testing)."""
+    with _response_cache_lock:
+        _response_cache.clear()
+
+
+def record_write_errors(updates: Dict[str, Any], write_errors: List[str]) -> Dict[str, Any]:
+    """Add failed artifact writes to a node's state updates.
+
+    Args:
+        updates: State updates returned by the node
+        write_errors: Messages for the failed writes, e.g. from wait_for_pending_writes()
+
+    Returns:
+        The same updates, with the failures appended to ``error``
+    """
+    if write_errors:
+        updates["error"] = "; ".join(filter(None, [updates.get("error"), *write_errors]))
+    return updates
+
 
 class BaseAgent(ABC):
     """Base class for all agents.
@@ -26,7 +155,8 @@ class BaseAgent(ABC):
         self,
         name: str,
         model_config: Optional[ModelConfig] = None,
-        system_prompt: Optional[str] = None
+        system_prompt: Optional[str] = None,
+        settings: Optional[Settings] = None
     ):
         """Initialize the base agent.
 
@@ -34,38 +164,36 @@ class BaseAgent(ABC):
             name: Agent name (for logging)
             model_config: Model configuration (uses default if None)
             system_prompt: System prompt for the agent
+            settings: Settings already fetched by the subclass (uses global if None)
         """
         self.name = name
-        self.model_config = model_config or get_settings().default_model
+        self.settings = settings or get_settings()
+        self.model_config = model_config or self.settings.default_model
         self.system_prompt = system_prompt or self._get_default_system_prompt()
 
-        # Initialize LLM
-        self.llm = self._create_llm()
+        # LLM client is created on first use; agents driving the Claude CLI never need it
+        self._llm: Optional["BaseChatModel"] = None
 
         logger.debug(f"Initialized agent: {self.name}")
 
-    def _create_llm(self) -> ChatAnthropic:
-        """Create the LLM instance for this agent.
+    @property
+    def llm(self) -> "BaseChatModel":
+        """Get the LLM instance, creating it on first access.
 
         Returns:
             ChatAnthropic instance
         """
-        settings = get_settings()
-
-        # Build kwargs for ChatAnthropic
-        kwargs = {
-            "model": self.model_config.model,
-            "temperature": self.model_config.temperature,
-            "max_tokens": self.model_config.max_tokens,
-            "timeout": self.model_config.timeout,
-            "api_key": settings.anthropic_api_key,
-        }
+        if self._llm is None:
+            self._llm = self._create_llm()
+        return self._llm
 
-        # Add base_url if configured
-        if self.model_config.base_url:
-            kwargs["base_url"] = self.model_config.base_url
+    def _create_llm(self) -> "BaseChatModel":
+        """Get the LLM instance for this agent from the shared client pool.
 
-        return ChatAnthropic(**kwargs)
+        Returns:
+            ChatAnthropic instance
+        """
+        return get_llm_client(self.model_config, self.settings.anthropic_api_key)
 
     @abstractmethod
     def _get_default_system_prompt(self) -> str:
@@ -102,34 +230,163 @@ class BaseAgent(ABC):
         Returns:
             LLM response text
         """
-        messages = []
+        cache_key = self._response_cache_key(prompt, system_prompt)
+        if cache_key and (cached := get_cached_response(cache_key)) is not None:
+            logger.info(f"[{self.name}] Reusing cached LLM response for identical prompt")
+            return cached
 
-        # Add system prompt
-        sys_prompt = system_prompt or self.system_prompt
-        if sys_prompt:
-            messages.append(SystemMessage(content=sys_prompt))
-
-        # Add user prompt
-        messages.append(HumanMessage(content=prompt))
+        messages = self._build_messages(prompt, system_prompt)
 
-        # Log the prompt (truncated)
-        log_prompt = truncate_text(prompt, 200)
-        logger.debug(f"[{self.name}] Invoking LLM with prompt: {log_prompt}")
+        # Log the prompt (truncated by the %.200s format, only if debug logging is on)
+        logger.debug("[%s] Invoking LLM with prompt: %.200s", self.name, prompt)
 
         try:
             response = self.llm.invoke(messages)
             result = response.content if hasattr(response, 'content') else str(response)
 
             # Log the response (truncated)
-            log_result = truncate_text(result, 200)
-            logger.debug(f"[{self.name}] LLM response: {log_result}")
+            logger.debug("[%s] LLM response: %.200s", self.name, result)
 
+            if cache_key:
+                cache_response(cache_key, result, self.settings.agent.llm_response_cache_size)
             return result
 
         except Exception as e:
             logger.error(f"[{self.name}] LLM invocation failed: {e}")
             raise
 
+    async def ainvoke_llm(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None
+    ) -> str:
+        """Invoke the LLM asynchronously with a prompt.
+
+        Allows several agents to keep requests in flight at the same time,
+        so a batching inference endpoint can serve them together.
+
+        Args:
+            prompt: User prompt to send
+            system_prompt: Optional override for system prompt
+
+        Returns:
+            LLM response text
+        """
+        cache_key = self._response_cache_key(prompt, system_prompt)
+        if cache_key and (cached := get_cached_response(cache_key)) is not None:
+            logger.info(f"[{self.name}] Reusing cached LLM response for identical prompt")
+            return cached
+
+        messages = self._build_messages(prompt, system_prompt)
+
+        logger.debug("[%s] Invoking LLM (async) with prompt: %.200s", self.name, prompt)
+
+        try:
+            response = await self.llm.ainvoke(messages)
+            result = response.content if hasattr(response, 'content') else str(response)
+
+            logger.debug("[%s] LLM response: %.200s", self.name, result)
+
+            if cache_key:
+                cache_response(cache_key, result, self.settings.agent.llm_response_cache_size)
+            return result
+
+        except Exception as e:
+            logger.error(f"[{self.name}] LLM invocation failed: {e}")
+            raise
+
+    async def abatch_invoke_llm(
+        self,
+        prompts: List[str],
+        system_prompt: Optional[str] = None
+    ) -> List[Union[str, Exception]]:
+        """Invoke the LLM on several prompts concurrently.
+
+        Requests are issued through ``abatch`` with at most
+        ``max_concurrent_llm_requests`` in flight. A failed prompt yields
+        its exception instead of failing the whole batch.
+
+        Args:
+            prompts: User prompts to send
+            system_prompt: Optional override for system prompt
+
+        Returns:
+            LLM response text (or the raised exception) per prompt, in order
+        """
+        logger.info(f"[{self.name}] Invoking LLM on a batch of {len(prompts)} prompts")
+        responses = await self.llm.abatch(
+            [self._build_messages(prompt, system_prompt) for prompt in prompts],
+            config={"max_concurrency": max(1, self.settings.agent.max_concurrent_llm_requests)},
+            return_exceptions=True
+        )
+
+        results: List[Union[str, Exception]] = []
+        for response in responses:
+            if isinstance(response, Exception):
+                logger.error(f"[{self.name}] LLM invocation failed: {response}")
+                results.append(response)
+            else:
+                results.append(response.content if hasattr(response, 'content') else str(response))
+        return results
+
+    def _response_cache_key(self, prompt: str, system_prompt: Optional[str] = None) -> Optional[str]:
+        """Hash everything that determines an LLM response.
+
+        Args:
+            prompt: User prompt to send
+            system_prompt: Optional override for system prompt
+
+        Returns:
+            Hex digest, or None if the response cache is disabled
+        """
+        if self.settings.agent.llm_response_cache_size <= 0:
+            return None
+        config = self.model_config
+        request = "\x00".join((
+            config.model, str(config.temperature), str(config.max_tokens), config.base_url or "",
+            system_prompt or self.system_prompt or "", prompt,
+        ))
+        return hashlib.blake2b(request.encode(), digest_size=16).hexdigest()
+
+    def _build_messages(self, prompt: str, system_prompt: Optional[str] = None) -> list:
+        """Build the message list for a single-turn LLM invocation.
+
+        Args:
+            prompt: User prompt to send
+            system_prompt: Optional override for system prompt
+
+        Returns:
+            List of message objects
+        """
+        messages = []
+
+        # Add system prompt
+        sys_prompt = system_prompt or self.system_prompt
+        if sys_prompt:
+            messages.append(self._system_message(sys_prompt))
+
+        # Add user prompt
+        messages.append(HumanMessage(content=prompt))
+        return messages
+
+    def _system_message(self, sys_prompt: str) -> SystemMessage:
+        """Wrap a system prompt, marking it as a prompt-cache breakpoint if enabled.
+
+        The system prompt is the static prefix of every request an agent
+        sends, so caching it lets repeated calls reuse the prefix.
+
+        Args:
+            sys_prompt: System prompt text
+
+        Returns:
+            SystemMessage instance
+        """
+        if not self.settings.agent.prompt_caching:
+            return SystemMessage(content=sys_prompt)
+        return SystemMessage(content=[
+            {"type": "text", "text": sys_prompt, "cache_control": {"type": "ephemeral"}}
+        ])
+
     def invoke_llm_with_history(
         self,
         messages: list,
@@ -147,18 +404,17 @@ class BaseAgent(ABC):
         # Prepend system prompt if provided
         if system_prompt or self.system_prompt:
             sys_prompt = system_prompt or self.system_prompt
-            messages = [SystemMessage(content=sys_prompt)] + messages
+            messages = [self._system_message(sys_prompt)] + messages
 
         # Log invocation
-        logger.debug(f"[{self.name}] Invoking LLM with {len(messages)} messages")
+        logger.debug("[%s] Invoking LLM with %d messages", self.name, len(messages))
 
         try:
             response = self.llm.invoke(messages)
             result = response.content if hasattr(response, 'content') else str(response)
 
             # Log the response (truncated)
-            log_result = truncate_text(result, 200)
-            logger.debug(f"[{self.name}] LLM response: {log_result}")
+            logger.debug("[%s] LLM response: %.200s", self.name, result)
 
             return result
 
@@ -247,7 +503,8 @@ class LLMAgent(BaseAgent):
         self,
         name: str,
         model_config: Optional[ModelConfig] = None,
-        system_prompt: Optional[str] = None
+        system_prompt: Optional[str] = None,
+        settings: Optional[Settings] = None
     ):
         """Initialize the LLM agent.
 
@@ -255,8 +512,9 @@ class LLMAgent(BaseAgent):
             name: Agent name
             model_config: Model configuration
             system_prompt: System prompt
+            settings: Settings already fetched by the subclass
         """
-        super().__init__(name, model_config, system_prompt)
+        super().__init__(name, model_config, system_prompt, settings)
 
     @abstractmethod
     def _get_default_system_prompt(self) -> str:
@@ -321,6 +579,81 @@ class LLMAgent(BaseAgent):
             self.set_error(state, error_msg)
             return {"error": error_msg}
 
+    async def aexecute(self, state: AgentState) -> Dict[str, Any]:
+        """Execute the agent asynchronously: invoke LLM and parse response.
+
+        Mirrors ``execute`` but awaits the LLM call, so several agents can be
+        gathered concurrently (see ``gather_with_concurrency``).
+
+        Args:
+            state: Current agent state
+
+        Returns:
+            Dictionary of state updates
+        """
+        logger.info(f"[{self.name}] Executing agent (async)")
+
+        try:
+            prompt = self._build_prompt(state)
+            response = await self.ainvoke_llm(prompt)
+            updates = self._parse_response(response, state)
+
+            self.add_message(state, "Completed successfully")
+
+            logger.info(f"[{self.name}] Execution completed")
+            return updates
+
+        except Exception as e:
+            error_msg = f"Execution failed: {e}"
+            logger.error(f"[{self.name}] {error_msg}")
+            self.set_error(state, error_msg)
+            return {"error": error_msg}
+
+    async def aexecute_batch(self, states: List[AgentState]) -> List[Dict[str, Any]]:
+        """Execute the agent for several states with one batched LLM call.
+
+        Useful for generating multiple variants (e.g. alternative PRDs)
+        in roughly the latency of a single request.
+
+        Args:
+            states: Agent states, one per variant
+
+        Returns:
+            Dictionary of state updates per state, in order
+        """
+        logger.info(f"[{self.name}] Executing agent for {len(states)} states (batch)")
+
+        prompts = [self._build_prompt(state) for state in states]
+        responses = await self.abatch_invoke_llm(prompts)
+
+        results = []
+        for state, response in zip(states, responses):
+            try:
+                if isinstance(response, Exception):
+                    raise response
+                updates = self._parse_response(response, state)
+                self.add_message(state, "Completed successfully")
+                results.append(updates)
+            except Exception as e:
+                error_msg = f"Execution failed: {e}"
+                logger.error(f"[{self.name}] {error_msg}")
+                self.set_error(state, error_msg)
+                results.append({"error": error_msg})
+
+        logger.info(f"[{self.name}] Batch execution completed")
+        return results
+
+    def execute_batch(self, states: List[AgentState]) -> List[Dict[str, Any]]:
+        """Synchronous wrapper around :meth:`aexecute_batch`.
+
+        Args:
+            states: Agent states, one per variant
+
+        Returns:
+            Dictionary of state updates per state, in order
+        """
+        return asyncio.run(self.aexecute_batch(states))
+
 
 class ToolAgent(BaseAgent):
     """Agent that uses tools (like Claude CLI) for execution.
@@ -333,7 +666,8 @@ class ToolAgent(BaseAgent):
         self,
         name: str,
         model_config: Optional[ModelConfig] = None,
-        system_prompt: Optional[str] = None
+        system_prompt: Optional[str] = None,
+        settings: Optional[Settings] = None
     ):
         """Initialize the tool agent.
 
@@ -341,8 +675,9 @@ class ToolAgent(BaseAgent):
             name: Agent name
             model_config: Model configuration
             system_prompt: System prompt
+            settings: Settings already fetched by the subclass
         """
-        super().__init__(name, model_config, system_prompt)
+        super().__init__(name, model_config, system_prompt, settings)
 
     @abstractmethod
     def _get_default_system_prompt(self) -> str:
@@ -1,14 +1,24 @@
 """Coder Agent for executing coding tasks via Claude Code CLI."""
 
-from datetime import datetime
-from typing import Any, Dict, List
-
-from ..core.state import AgentState
+import asyncio
+import atexit
+import os
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core.state import AgentState, merge_task_list
+from ..core.task_table import TaskScheduler, TaskTable
 from ..agents.base import ToolAgent
 from ..config.settings import get_settings
 from ..config.prompts import CODER_SYSTEM_PROMPT, get_coder_prompt
-from ..tools.claude_cli import run_claude_cli, create_non_interactive_prompt
-from ..tools.file_ops import read_file, get_ready_tasks, get_task_by_id, update_tasks_json_file
+from ..tools.claude_cli import (
+    ClaudeCLIResult, ClaudeDaemonPool, get_claude_cli, run_claude_cli, run_claude_cli_async,
+    create_non_interactive_prompt
+)
+from ..tools.file_ops import read_file
+from ..tools.write_batcher import get_write_batcher
 from ..tools.validation import validate_coding_output
 from ..utils.logger import get_logger
 from ..utils.helpers import generate_session_id
@@ -16,6 +26,29 @@ from ..utils.helpers import generate_session_id
 
 logger = get_logger()
 
+# design_path -> ((mtime_ns, size), content). Module-level so it outlives the
+# agent instances that coder_agent_node creates for every task.
+_design_cache: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+_BANNER = "=" * 60
+
+_TASK_CONSTRAINTS = [
+    "Do not ask for confirmation",
+    "Create all necessary files",
+    "Follow the design specification",
+    "Include error handling",
+    "Write clean, readable code"
+]
+
+# create_non_interactive_prompt() output split around the two values that vary
+# per task (work_dir, then task_description), so the constant header and
+# constraint list are formatted once at import instead of for every task
+_PROMPT_HEAD, _PROMPT_MID, _PROMPT_TAIL = create_non_interactive_prompt(
+    task_description="\x00",
+    context="Working in directory: \x00",
+    constraints=_TASK_CONSTRAINTS
+).split("\x00")
+
 
 class CoderAgent(ToolAgent):
     """Coder Agent responsible for code execution.
@@ -33,9 +66,18 @@ class CoderAgent(ToolAgent):
         super().__init__(
             name="Coder_Agent",
             model_config=settings.coder_model,
-            system_prompt=CODER_SYSTEM_PROMPT
+            system_prompt=CODER_SYSTEM_PROMPT,
+            settings=settings
         )
         self.max_iterations = settings.agent.max_coding_iterations
+        self.max_parallel_tasks = settings.agent.max_parallel_tasks
+        # The design is shared by every task, so read it once per modification
+        self._design_cache = _design_cache
+        # Columnar view of the task list being executed
+        self._table: TaskTable | None = None
+        self._batcher = get_write_batcher()
+        # Idle persistent Claude CLI processes, one slot per parallel worker (batch mode only)
+        self._daemon_pool: ClaudeDaemonPool | None = None
 
     def _get_default_system_prompt(self) -> str:
         """Get the default system prompt for Coder agent."""
@@ -50,9 +92,9 @@ class CoderAgent(ToolAgent):
         Returns:
             Dictionary of state updates
         """
-        task_list = state.get("task_list", [])
+        task_list = state.get("task_list") or []
         current_index = state.get("current_task_index", 0)
-        completed_tasks = state.get("completed_tasks", [])
+        completed_tasks = state.get("completed_tasks") or []
         coding_iterations = state.get("coding_iterations", 0)
 
         if not task_list:
@@ -62,6 +104,8 @@ class CoderAgent(ToolAgent):
                 "coding_output": "No tasks to execute"
             }
 
+        table = self._get_table(task_list)
+
         # Check if we're done
         if current_index >= len(task_list):
             logger.info("All tasks completed")
@@ -80,35 +124,38 @@ class CoderAgent(ToolAgent):
 
         # Get current task
         task = task_list[current_index]
+        completed_ids = set(completed_tasks)
 
         # Check if task is already completed
-        if task["id"] in completed_tasks or task.get("status") == "completed":
+        if task["id"] in completed_ids or table.statuses[current_index] == "completed":
             logger.info(f"Task {task['id']} already completed, skipping")
             return {
                 "current_task_index": current_index + 1,
                 "coding_output": f"Task {task['id']} already completed"
             }
 
-        # Check dependencies
-        dependencies = task.get("dependencies", [])
-        if not all(dep in completed_tasks for dep in dependencies):
+        # Check dependencies (most tasks have none, which skips the subset test).
+        # The architect stores tasks in dependency order, so this only fails
+        # after a task failure or with task lists from older sessions.
+        deps = table.deps[current_index]
+        if deps and not deps <= completed_ids:
             logger.info(f"Task {task['id']} has unmet dependencies, skipping")
             # Try to find a task that can be executed
-            ready_tasks = get_ready_tasks(task_list, completed_tasks)
-            if ready_tasks:
+            ready_indices = table.ready_indices(completed_ids)
+            if ready_indices:
                 # Execute the first ready task instead
-                next_task = ready_tasks[0]
-                next_index = next((i for i, t in enumerate(task_list) if t["id"] == next_task["id"]), current_index)
+                next_index = ready_indices[0]
                 return {
                     "current_task_index": next_index,
-                    "coding_output": f"Switched to task {next_task['id']} (unmet dependencies for {task['id']})"
+                    "coding_output": f"Switched to task {table.ids[next_index]} (unmet dependencies for {task['id']})"
                 }
             else:
-                # No tasks ready, we're stuck
-                logger.error("No tasks ready to execute (circular dependencies?)")
+                # No tasks ready: cycles are rejected after the architect stage,
+                # so the remaining dependencies are unknown or never completed
+                logger.error("No tasks ready to execute (unsatisfiable dependencies)")
                 return {
                     "stage": "done",
-                    "coding_output": "No tasks ready to execute - possible circular dependencies"
+                    "coding_output": "No tasks ready to execute - unsatisfiable dependencies"
                 }
 
         # Execute the current task
@@ -124,26 +171,67 @@ class CoderAgent(ToolAgent):
         Returns:
             Dictionary of state updates
         """
-        # Record task start time
-        task_start_time = datetime.now()
-
-        task_list = state.get("task_list", [])
+        task_list = state.get("task_list") or []
         current_index = state.get("current_task_index", 0)
+        coding_iterations = state.get("coding_iterations", 0)
+        session_id = state.get("session_id") or generate_session_id()
         total_tasks = len(task_list)
         task_number = current_index + 1
         progress_percent = (task_number / total_tasks * 100) if total_tasks > 0 else 0
 
         # Detailed task start logging
-        logger.info("=" * 60)
-        logger.info(f"正在执行任务 [{task_number}/{total_tasks}] - 进度 {progress_percent:.1f}%")
-        logger.info(f"任务 ID: {task['id']}")
-        logger.info(f"任务标题: {task['title']}")
-        logger.info(f"任务描述: {task.get('description', 'N/A')}")
-        logger.info("=" * 60)
-
-        # Get workspace - use project_dir if specified, otherwise use default code directory
-        session_id = state.get("session_id", generate_session_id())
-        settings = get_settings()
+        logger.info(
+            "%s\n正在执行任务 [%d/%d] - 进度 %.1f%%\n任务 ID: %s\n任务标题: %s\n任务描述: %s\n%s",
+            _BANNER, task_number, total_tasks, progress_percent,
+            task["id"], task["title"], task.get("description", "N/A"), _BANNER
+        )
+
+        work_dir, add_dir = self._resolve_directories(state, session_id)
+
+        # Keep one warm Claude CLI process across single-task ticks
+        if self.settings.claude_cli.persistent_session:
+            self._open_daemon_pool(work_dir, add_dir, 1)
+
+        result, task_started_at, duration_seconds = self._run_task(
+            task, work_dir, add_dir, state.get("design_file_path", "")
+        )
+        task_fields = self._record_task_result(task, result, task_started_at, duration_seconds)
+        task_patch = {task["id"]: task_fields}
+
+        # Sync task status to tasks.json (coalesced with neighbouring updates).
+        # The state's task dicts are left untouched; the graph applies the patch.
+        self._batcher.enqueue(session_id, merge_task_list(task_list, task_patch))
+
+        if result.success:
+            return {
+                "task_list": task_patch,
+                "current_task_index": current_index + 1,
+                "completed_tasks": [task["id"]],
+                "coding_iterations": coding_iterations + 1,
+                "coding_output": f"Task {task['id']} completed: {result.output[:500]}",
+                "stage": "dev",
+                "code_directory": work_dir
+            }
+        else:
+            error_msg = f"Task {task['id']} failed: {result.error}"
+            return {
+                "task_list": task_patch,
+                "error": error_msg,
+                "coding_iterations": coding_iterations + 1,
+                "coding_output": error_msg
+            }
+
+    def _resolve_directories(self, state: AgentState, session_id: str) -> Tuple[str, str]:
+        """Resolve where Claude Code runs and which directory it may read.
+
+        Args:
+            state: Current agent state
+            session_id: Session identifier
+
+        Returns:
+            Tuple of (work_dir, add_dir)
+        """
+        settings = self.settings
         project_dir = state.get("project_dir", "")
 
         # Get workspace directory (contains PRD.md, Design.md, tasks.json)
@@ -155,31 +243,105 @@ class CoderAgent(ToolAgent):
             work_dir = project_dir
             # --add-dir only needs workspace_dir so Claude can read PRD.md, Design.md, etc.
             add_dir = workspace_dir
-            logger.info(f"Using project directory: {work_dir}")
-            logger.info(f"Adding workspace to --add-dir: {workspace_dir}")
+            logger.info("Using project directory: %s", work_dir)
+            logger.info("Adding workspace to --add-dir: %s", workspace_dir)
         else:
             # Use default workspace code directory
             work_dir = str(settings.get_code_directory(session_id))
             add_dir = workspace_dir
-            logger.info(f"Using default workspace directory: {work_dir}")
+            logger.info("Using default workspace directory: %s", work_dir)
 
-        design_path = state.get("design_file_path", "")
+        return work_dir, add_dir
 
+    def _run_task(
+        self,
+        task: Dict[str, Any],
+        work_dir: str,
+        add_dir: str,
+        design_path: str
+    ) -> Tuple[Any, float, float]:
+        """Run one task through Claude Code CLI without touching agent state.
+
+        Safe to call from worker threads; the caller applies the result.
+
+        Args:
+            task: Task to execute
+            work_dir: Directory Claude Code runs in
+            add_dir: Extra directory Claude Code may read
+            design_path: Path to Design.md, or empty string
+
+        Returns:
+            Tuple of (CLI result, wall-clock start timestamp, duration in seconds)
+        """
+        task_started_at = time.time()
+        task_start_mono = time.monotonic()
+
+        prompt = self._build_task_prompt(task, work_dir, design_path)
+
+        # Execute via Claude Code CLI
+        result = self._invoke_cli(prompt, work_dir, add_dir)
+
+        return result, task_started_at, time.monotonic() - task_start_mono
+
+    async def _run_task_async(
+        self,
+        task: Dict[str, Any],
+        work_dir: str,
+        add_dir: str,
+        design_path: str
+    ) -> Tuple[Any, float, float]:
+        """Coroutine version of :meth:`_run_task` used by the batch scheduler.
+
+        One-off CLI processes are awaited directly on the event loop;
+        persistent processes are driven by blocking reads, so that path
+        still runs in a worker thread.
+
+        Args:
+            task: Task to execute
+            work_dir: Directory Claude Code runs in
+            add_dir: Extra directory Claude Code may read
+            design_path: Path to Design.md, or empty string
+
+        Returns:
+            Tuple of (CLI result, wall-clock start timestamp, duration in seconds)
+        """
+        if self._daemon_pool is not None:
+            return await asyncio.to_thread(self._run_task, task, work_dir, add_dir, design_path)
+
+        task_started_at = time.time()
+        task_start_mono = time.monotonic()
+
+        prompt = self._build_task_prompt(task, work_dir, design_path)
+        result = await run_claude_cli_async(prompt=prompt, work_dir=work_dir, add_dir=add_dir)
+
+        return result, task_started_at, time.monotonic() - task_start_mono
+
+    def _build_task_prompt(self, task: Dict[str, Any], work_dir: str, design_path: str) -> str:
+        """Build the Claude Code CLI prompt for a task.
+
+        Args:
+            task: Task to execute
+            work_dir: Directory Claude Code runs in
+            design_path: Path to Design.md, or empty string
+
+        Returns:
+            Prompt string
+        """
         # Read design for context
         design_content = ""
         if design_path:
             try:
-                design_content = read_file(design_path)
-                logger.info(f"Read design content from {design_path} ({len(design_content)} chars)")
+                design_content = self._read_design(design_path)
             except Exception as e:
-                logger.warning(f"Could not read design file: {e}")
+                logger.warning("Could not read design file: %s", e)
 
         # Build the prompt for Claude Code CLI
-        # Include the actual design content so Claude Code knows what to implement
+        # Include the actual design content so Claude Code knows what to implement.
+        # The design is identical for every task, so it goes first: a stable prompt
+        # prefix lets the model backend reuse its cached prefill across tasks.
         design_section = ""
         if design_content:
             design_section = f"""
-
 ## Technical Design (from {design_path})
 
 {design_content}
@@ -187,100 +349,142 @@ class CoderAgent(ToolAgent):
 ---
 """
 
-        task_description = f"""
+        task_description = f"""{design_section}
 Task ID: {task['id']}
 Title: {task['title']}
 Description: {task.get('description', '')}
-{design_section}
+
 Implement this task according to the technical design above.
 """
-        prompt = create_non_interactive_prompt(
-            task_description=task_description,
-            context=f"Working in directory: {work_dir}",
-            constraints=[
-                "Do not ask for confirmation",
-                "Create all necessary files",
-                "Follow the design specification",
-                "Include error handling",
-                "Write clean, readable code"
-            ]
-        )
+        return f"{_PROMPT_HEAD}{work_dir}{_PROMPT_MID}{task_description}{_PROMPT_TAIL}"
 
-        # Execute via Claude Code CLI
-        result = run_claude_cli(
-            prompt=prompt,
-            work_dir=work_dir,
-            add_dir=add_dir  # Use --add-dir to specify the working directory
-        )
+    def _invoke_cli(self, prompt: str, work_dir: str, add_dir: str) -> Any:
+        """Send a prompt to Claude Code, through a persistent process when enabled.
+
+        Falls back to spawning a one-off process if the persistent one cannot
+        be started or dies mid-task.
 
-        # Process result
+        Args:
+            prompt: Prompt to send
+            work_dir: Directory Claude Code runs in
+            add_dir: Extra directory Claude Code may read
+
+        Returns:
+            Claude Code CLI result
+        """
+        pool = self._daemon_pool
+        if pool is None or not pool.matches(work_dir, add_dir):
+            return run_claude_cli(
+                prompt=prompt,
+                work_dir=work_dir,
+                add_dir=add_dir  # Use --add-dir to specify the working directory
+            )
+        return pool.send(prompt)
+
+    def _open_daemon_pool(self, work_dir: str, add_dir: str, size: int) -> None:
+        """Make sure a persistent Claude CLI pool serves work_dir with at least size processes.
+
+        An existing pool for the same directories is kept, so its processes
+        stay warm across graph ticks (the node agent is reused).
+
+        Args:
+            work_dir: Directory Claude Code runs in
+            add_dir: Extra directory Claude Code may read
+            size: Number of processes needed
+        """
+        pool = self._daemon_pool
+        if pool is not None and pool.matches(work_dir, add_dir) and pool.size >= size:
+            return
+        self._close_daemon_pool()
+        self._daemon_pool = get_claude_cli().open_daemon_pool(size, work_dir, add_dir)
+        atexit.register(self._daemon_pool.close)
+
+    def _close_daemon_pool(self) -> None:
+        """Stop the persistent Claude CLI processes, if any."""
+        pool = self._daemon_pool
+        if pool is not None:
+            atexit.unregister(pool.close)
+            pool.close()
+            self._daemon_pool = None
+
+    def _record_task_result(
+        self,
+        task: Dict[str, Any],
+        result: Any,
+        task_started_at: float,
+        duration_seconds: float
+    ) -> Dict[str, Any]:
+        """Build the outcome and timing fields for an executed task.
+
+        Args:
+            task: Task that was executed
+            result: Claude Code CLI result
+            task_started_at: Wall-clock timestamp when the task started
+            duration_seconds: Monotonic duration of the task
+
+        Returns:
+            The fields that changed, usable as a task_list patch
+        """
         if result.success:
-            logger.info(f"Task {task['id']} completed successfully")
-
-            # Calculate duration
-            task_end_time = datetime.now()
-            duration_seconds = (task_end_time - task_start_time).total_seconds()
-
-            # Update task status in task list
-            task_list = state.get("task_list", [])
-            for t in task_list:
-                if t["id"] == task["id"]:
-                    t["status"] = "completed"
-                    t["started_at"] = task_start_time.isoformat()
-                    t["completed_at"] = task_end_time.isoformat()
-                    t["duration"] = round(duration_seconds, 2)
-                    break
-
-            # Update completed tasks
-            completed_tasks = state.get("completed_tasks", [])
-            completed_tasks.append(task["id"])
-
-            # Sync task status to tasks.json
-            update_tasks_json_file(session_id, task_list)
-
-            # Update state
-            current_index = state.get("current_task_index", 0)
-            return {
-                "task_list": task_list,
-                "current_task_index": current_index + 1,
-                "completed_tasks": completed_tasks,
-                "coding_iterations": state.get("coding_iterations", 0) + 1,
-                "coding_output": f"Task {task['id']} completed: {result.output[:500]}",
-                "stage": "dev",
-                "code_directory": work_dir
-            }
+            logger.info("Task %s completed successfully", task["id"])
         else:
-            error_msg = f"Task {task['id']} failed: {result.error}"
-            logger.error(error_msg)
-
-            # Calculate duration
-            task_end_time = datetime.now()
-            duration_seconds = (task_end_time - task_start_time).total_seconds()
+            logger.error("Task %s failed: %s", task["id"], result.error)
 
+        # Timestamps are only formatted here, when they are stored
+        finished_at = datetime.fromtimestamp(task_started_at + duration_seconds, timezone.utc).isoformat()
+        fields: Dict[str, Any] = {
+            "started_at": datetime.fromtimestamp(task_started_at, timezone.utc).isoformat(),
+            "duration": round(duration_seconds, 2),
+        }
+        if result.success:
+            fields["status"] = "completed"
+            fields["completed_at"] = finished_at
+        else:
             # Mark task as failed/blocked
-            task_list = state.get("task_list", [])
-            for t in task_list:
-                if t["id"] == task["id"]:
-                    t["status"] = "blocked"
-                    t["started_at"] = task_start_time.isoformat()
-                    t["blocked_at"] = task_end_time.isoformat()
-                    t["duration"] = round(duration_seconds, 2)
-                    break
-
-            # Sync task status to tasks.json
-            update_tasks_json_file(session_id, task_list)
+            fields["status"] = "blocked"
+            fields["blocked_at"] = finished_at
 
-            return {
-                "task_list": task_list,
-                "error": error_msg,
-                "coding_iterations": state.get("coding_iterations", 0) + 1,
-                "coding_output": error_msg
-            }
+        return fields
+
+    def _get_table(self, task_list: List[Dict[str, Any]]) -> TaskTable:
+        """Get the columnar view of task_list, reusing it while the list is unchanged.
+
+        Args:
+            task_list: List of tasks being executed
+
+        Returns:
+            TaskTable over task_list
+        """
+        if self._table is None or not self._table.matches(task_list):
+            self._table = TaskTable(task_list)
+        return self._table
+
+    def _read_design(self, design_path: str) -> str:
+        """Read the design document, reusing the cached copy while it is unchanged.
+
+        Args:
+            design_path: Path to Design.md
+
+        Returns:
+            Design document content
+        """
+        st = os.stat(design_path)
+        # Nanosecond mtime plus size catches rewrites within the float-mtime
+        # resolution; storing one entry per path drops the stale version
+        version = (st.st_mtime_ns, st.st_size)
+        cached = self._design_cache.get(design_path)
+        if cached is None or cached[0] != version:
+            content = read_file(design_path)
+            self._design_cache[design_path] = (version, content)
+            logger.info("Read design content from %s (%d chars)", design_path, len(content))
+            return content
+        return cached[1]
 
     def execute_all_tasks(self, state: AgentState) -> Dict[str, Any]:
         """Execute all remaining tasks in a batch.
 
-        This method loops through all tasks and executes them.
+        Independent tasks run concurrently (up to ``max_parallel_tasks``),
+        and each task starts as soon as all of its dependencies complete.
         Returns when all tasks are done or max iterations reached.
 
         Args:
@@ -289,87 +493,206 @@ Implement this task according to the technical design above.
         Returns:
             Dictionary of state updates
         """
-        import time
+        return asyncio.run(self._execute_all_tasks_async(state))
+
+    async def _execute_all_tasks_async(self, state: AgentState) -> Dict[str, Any]:
+        """Async driver for :meth:`execute_all_tasks`.
+
+        Args:
+            state: Current agent state
 
+        Returns:
+            Dictionary of state updates
+        """
         # Get session_id for task status sync
-        session_id = state.get("session_id", generate_session_id())
+        session_id = state.get("session_id") or generate_session_id()
 
-        task_list = state.get("task_list", [])
+        # Results are written into copies, never into the dicts held by the graph state
+        task_list = [dict(t) for t in state.get("task_list") or []]
         total_tasks = len(task_list)
-        completed_tasks = state.get("completed_tasks", [])
+        table = self._get_table(task_list)
+        completed_tasks = list(state.get("completed_tasks") or [])
+        # Tasks marked completed in tasks.json (e.g. on resume) satisfy dependencies too
+        seen = set(completed_tasks)
+        for task_id, status in zip(table.ids, table.statuses):
+            if status == "completed" and task_id not in seen:
+                completed_tasks.append(task_id)
+                seen.add(task_id)
         initial_completed = len(completed_tasks)
         remaining_tasks = total_tasks - initial_completed
 
-        logger.info("=" * 60)
-        logger.info(f"开始批量执行任务")
-        logger.info(f"总任务数: {total_tasks}")
-        logger.info(f"已完成: {initial_completed}")
-        logger.info(f"待执行: {remaining_tasks}")
-        logger.info("=" * 60)
+        logger.info(
+            "%s\n开始批量执行任务\n总任务数: %d\n已完成: %d\n待执行: %d\n最大并行任务数: %d\n%s",
+            _BANNER, total_tasks, initial_completed, remaining_tasks, self.max_parallel_tasks, _BANNER
+        )
+
+        work_dir, add_dir = self._resolve_directories(state, session_id)
+
+        if self.settings.claude_cli.persistent_session:
+            self._open_daemon_pool(work_dir, add_dir, max(1, self.max_parallel_tasks))
+
+        try:
+            return await self._run_scheduler(
+                session_id, task_list, completed_tasks, work_dir, add_dir,
+                design_path=state.get("design_file_path", ""),
+                coding_iterations=state.get("coding_iterations", 0)
+            )
+        finally:
+            # Batch mode runs every remaining task, so the processes are not needed afterwards
+            self._close_daemon_pool()
+
+    async def _run_scheduler(
+        self,
+        session_id: str,
+        task_list: List[Dict[str, Any]],
+        completed_tasks: List[str],
+        work_dir: str,
+        add_dir: str,
+        design_path: str,
+        coding_iterations: int
+    ) -> Dict[str, Any]:
+        """Run tasks as soon as their dependencies finish (Kahn's algorithm).
+
+        Every task with no unfinished dependencies is started, up to
+        ``max_parallel_tasks`` at a time. When a task completes, the
+        ``TaskScheduler`` releases the successors whose dependencies are
+        now all done and they are started. Failed tasks are queued again
+        until the iteration budget runs out.
+
+        Works only on the values passed in; the graph state is not read
+        again until the updates are returned.
 
+        Args:
+            session_id: Session identifier
+            task_list: List of tasks, updated in place
+            completed_tasks: Completed task IDs, extended in place
+            work_dir: Directory Claude Code runs in
+            add_dir: Extra directory Claude Code may read
+            design_path: Path to Design.md, or empty string
+            coding_iterations: Iterations already used before this batch
+
+        Returns:
+            Dictionary of state updates
+        """
+        total_tasks = len(task_list)
+        max_iterations = self.max_iterations
+        limit = max(1, self.max_parallel_tasks)
         start_time = time.time()
-        task_times = []
-
-        for i in range(self.max_iterations):
-            current_index = state.get("current_task_index", 0)
-            current_completed = len(state.get("completed_tasks", []))
-
-            # Check if done
-            if current_index >= len(task_list):
-                elapsed = int(time.time() - start_time)
-                logger.info("=" * 60)
-                logger.info(f"所有任务已完成!")
-                logger.info(f"总用时: {elapsed} 秒")
-                logger.info(f"完成任务数: {current_completed}/{total_tasks}")
-                logger.info("=" * 60)
-                return {
-                    "stage": "done",
-                    "coding_output": f"Completed all {total_tasks} tasks"
-                }
+        attempts = 0
+
+        table = self._get_table(task_list)
+        scheduler = TaskScheduler(table, completed_tasks)
+        ready = deque(scheduler.ready_tasks())
+        # Future -> (task, wall-clock launch time, monotonic launch time)
+        in_flight: Dict[asyncio.Future, Tuple[Dict[str, Any], float, float]] = {}
+
+        while ready or in_flight:
+            while ready and len(in_flight) < limit and attempts < max_iterations:
+                task = ready.popleft()
+                attempts += 1
+                logger.info("启动任务 %s (%d 个任务执行中)", task["id"], len(in_flight) + 1)
+                future = asyncio.ensure_future(
+                    self._run_task_async(task, work_dir, add_dir, design_path)
+                )
+                in_flight[future] = (task, time.time(), time.monotonic())
+
+            if not in_flight:
+                break
+
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+
+            # Results are merged on the event loop thread only, so no locking is needed.
+            # Tasks finishing together are recorded in start order, not set order.
+            for future in [f for f in in_flight if f in done]:
+                task, launched_at, launched_mono = in_flight.pop(future)
+                try:
+                    result, task_started_at, duration_seconds = future.result()
+                except Exception as e:
+                    # One task raising must not cancel the rest of the batch
+                    logger.exception("Task %s raised an exception", task["id"])
+                    result = ClaudeCLIResult(success=False, output="", error=f"{type(e).__name__}: {e}")
+                    task_started_at, duration_seconds = launched_at, time.monotonic() - launched_mono
+                table.update(task["id"], self._record_task_result(task, result, task_started_at, duration_seconds))
+                if result.success:
+                    completed_tasks.append(task["id"])
+                    ready.extend(table.get(successor) for successor in scheduler.complete(task["id"]))
+                else:
+                    logger.warning("任务执行失败，稍后重试")
+                    ready.append(task)
+
+            current_completed = len(completed_tasks)
+            progress = (current_completed / total_tasks * 100) if total_tasks > 0 else 0
+            logger.info("进度: %.1f%% (%d/%d)", progress, current_completed, total_tasks)
+
+            # Calculate ETA from the average task duration so far
+            avg_time = (time.time() - start_time) / attempts
+            eta_seconds = int(avg_time * (total_tasks - current_completed) / limit)
+            logger.info("预计剩余时间: %d 分 %d 秒", eta_seconds // 60, eta_seconds % 60)
+
+            # Sync task status to tasks.json (coalesced by the batcher)
+            self._batcher.enqueue(session_id, task_list)
+
+        # Make sure the final statuses are on disk before returning
+        self._batcher.enqueue(session_id, task_list, sync=True)
+
+        final_completed = len(completed_tasks)
+        elapsed = int(time.time() - start_time)
+        completed_ids = set(completed_tasks)
+        current_index = next(
+            (i for i, t in enumerate(task_list) if t["id"] not in completed_ids),
+            total_tasks
+        )
+        updates = {
+            "task_list": task_list,
+            "completed_tasks": completed_tasks,
+            "current_task_index": current_index,
+            "coding_iterations": coding_iterations + attempts,
+            "code_directory": work_dir,
+            "stage": "done"
+        }
 
-            # Show progress every 3 tasks or on first/last task
-            show_progress = (i == 0 or current_completed == total_tasks - 1 or
-                           (current_completed > 0 and current_completed % 3 == 0))
+        if current_index >= total_tasks:
+            logger.info(
+                "%s\n所有任务已完成!\n总用时: %d 秒\n完成任务数: %d/%d\n%s",
+                _BANNER, elapsed, final_completed, total_tasks, _BANNER
+            )
+            updates["coding_output"] = f"Completed all {total_tasks} tasks"
+        elif attempts < max_iterations:
+            logger.error("No tasks ready to execute (unsatisfiable dependencies)")
+            updates["coding_output"] = (f"No tasks ready to execute - unsatisfiable dependencies. "
+                                        f"Completed {final_completed}/{total_tasks} tasks")
+        else:
+            logger.warning(
+                "%s\n达到最大迭代次数\n已完成: %d/%d 任务\n总用时: %d 秒\n%s",
+                _BANNER, final_completed, total_tasks, elapsed, _BANNER
+            )
+            updates["coding_output"] = f"Reached maximum iterations. Completed {final_completed}/{total_tasks} tasks"
 
-            if show_progress:
-                progress = (current_completed / total_tasks * 100) if total_tasks > 0 else 0
-                logger.info(f"进度: {progress:.1f}% ({current_completed}/{total_tasks})")
+        return updates
 
-                # Calculate ETA if we have timing data
-                if task_times:
-                    avg_time = sum(task_times) / len(task_times)
-                    remaining = total_tasks - current_completed
-                    eta_seconds = int(avg_time * remaining)
-                    logger.info(f"预计剩余时间: {eta_seconds // 60} 分 {eta_seconds % 60} 秒")
 
-            # Execute current task
-            task_start = time.time()
-            updates = self._execute_tool(state)
-            task_elapsed = time.time() - task_start
-            task_times.append(task_elapsed)
+# Global coder agent instance, reused across graph ticks
+_coder_agent: Optional[CoderAgent] = None
 
-            state.update(updates)
 
-            # Sync task status to tasks.json after each task
-            if "task_list" in state:
-                update_tasks_json_file(session_id, state["task_list"])
+def get_coder_agent() -> CoderAgent:
+    """Get or create the global coder agent.
 
-            # Check for error
-            if updates.get("error"):
-                logger.warning(f"任务执行失败，继续下一个任务")
+    The agent is rebuilt when the global settings have been replaced.
 
-        # Reached max iterations
-        final_completed = len(state.get("completed_tasks", []))
-        elapsed = int(time.time() - start_time)
-        logger.warning("=" * 60)
-        logger.warning(f"达到最大迭代次数")
-        logger.warning(f"已完成: {final_completed}/{total_tasks} 任务")
-        logger.warning(f"总用时: {elapsed} 秒")
-        logger.warning("=" * 60)
-        return {
-            "stage": "done",
-            "coding_output": f"Reached maximum iterations. Completed {final_completed}/{total_tasks} tasks"
-        }
+    Returns:
+        CoderAgent instance
+    """
+    global _coder_agent
+    if _coder_agent is None or _coder_agent.settings is not get_settings():
+        _coder_agent = CoderAgent()
+    return _coder_agent
+
+
+def reset_coder_agent() -> None:
+    """Reset the global coder agent instance (useful for testing)."""
+    global _coder_agent
+    _coder_agent = None
 
 
 def coder_agent_node(state: AgentState) -> Dict[str, Any]:
@@ -384,11 +707,9 @@ def coder_agent_node(state: AgentState) -> Dict[str, Any]:
     Returns:
         Dictionary of state updates
     """
-    logger.info("=" * 60)
-    logger.info("Coder Agent Node Invoked")
-    logger.info("=" * 60)
+    logger.info("%s\nCoder Agent Node Invoked\n%s", _BANNER, _BANNER)
 
-    agent = CoderAgent()
+    agent = get_coder_agent()
     return agent.execute(state)
 
 
@@ -405,22 +726,21 @@ def check_coding_finished(state: AgentState) -> str:
     current_index = state.get("current_task_index", 0)
     coding_iterations = state.get("coding_iterations", 0)
 
-    # Get max iterations from settings
-    settings = get_settings()
-    max_iterations = settings.agent.max_coding_iterations
-
     # Check if all tasks are done
     if current_index >= len(task_list):
         logger.info("Coding phase complete - all tasks finished")
         return "coding_done"
 
+    # Get max iterations from the cached global settings
+    max_iterations = get_settings().agent.max_coding_iterations
+
     # Check if we've reached max iterations
     if coding_iterations >= max_iterations:
         logger.info(f"Coding phase complete - reached max iterations ({max_iterations})")
         return "coding_done"
 
     # Check if there's an error that prevents continuation
-    if state.get("error") and not state.get("task_list"):
+    if state.get("error") and not task_list:
         logger.warning("Coding phase stopped due to error")
         return "coding_done"
 
@@ -441,9 +761,7 @@ def coder_batch_node(state: AgentState) -> Dict[str, Any]:
     Returns:
         Dictionary of state updates
     """
-    logger.info("=" * 60)
-    logger.info("Coder Batch Node Invoked (Execute All Tasks)")
-    logger.info("=" * 60)
+    logger.info("%s\nCoder Batch Node Invoked (Execute All Tasks)\n%s", _BANNER, _BANNER)
 
-    agent = CoderAgent()
+    agent = get_coder_agent()
     return agent.execute_all_tasks(state)
@@ -1,20 +1,38 @@
 """PM Agent for generating Product Requirements Documents."""
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 import re
 
 from ..core.state import AgentState
 from ..agents.base import LLMAgent
 from ..config.settings import get_settings
 from ..config.prompts import PM_AGENT_SYSTEM_PROMPT, get_pm_prompt, get_pm_revision_prompt, get_pm_revision_with_reviews_prompt
-from ..tools.file_ops import write_file
+from ..tools.file_ops import submit_write, write_files
 from ..tools.validation import OutputValidator, validate_prd
 from ..utils.logger import get_logger
-from ..utils.helpers import generate_session_id
+from ..utils.helpers import format_timestamp, generate_session_id
 
 
 logger = get_logger()
 
+_BANNER = "=" * 60
+
+# Static head of PRD_Reviews.md; only the review time is filled in per write
+_REVIEWS_FILE_HEADER = "# PRD 评审意见汇总\n\n评审时间: {timestamp}\n\n---\n\n"
+
+# Section headings used in PRD_Reviews.md
+_REVIEWER_ROLE_NAMES = {
+    "pm": "产品经理",
+    "dev": "开发工程师",
+    "qa": "测试工程师",
+}
+
+# Revision summary section emitted when the PRD is revised after reviews
+_REVISION_SUMMARY_RE = re.compile(
+    r"# (PRD 修订说明|PRD Revision)\s*\n## (主要变更内容|Major Changes)\s*\n(.*?)(?=\n##|$)",
+    re.DOTALL | re.MULTILINE
+)
+
 
 class PMAgent(LLMAgent):
     """Product Manager Agent responsible for PRD generation.
@@ -31,7 +49,8 @@ class PMAgent(LLMAgent):
         super().__init__(
             name="PM_Agent",
             model_config=settings.pm_model,
-            system_prompt=PM_AGENT_SYSTEM_PROMPT
+            system_prompt=PM_AGENT_SYSTEM_PROMPT,
+            settings=settings
         )
 
     def _get_default_system_prompt(self) -> str:
@@ -78,25 +97,33 @@ class PMAgent(LLMAgent):
         """
         logger.info("Parsing PRD response")
 
+        # A revision can come back unchanged; it was validated when first generated
+        same_content = response == state.get("prd_content")
+
         # Validate PRD content
-        is_valid, errors = validate_prd(response)
-        if not is_valid:
-            error_msg = f"PRD validation failed: {errors}"
-            logger.warning(error_msg)
-            # Still continue with the content, but log the issues
+        if not same_content:
+            is_valid, errors = validate_prd(response)
+            if not is_valid:
+                error_msg = f"PRD validation failed: {errors}"
+                logger.warning(error_msg)
+                # Still continue with the content, but log the issues
 
         # Save PRD to file
-        session_id = state.get("session_id", generate_session_id())
-        settings = get_settings()
-        workspace = settings.get_session_workspace(session_id)
+        session_id = state.get("session_id") or generate_session_id()
+        workspace = self.settings.get_session_workspace(session_id)
         prd_path = workspace / "PRD.md"
 
-        try:
-            write_file(prd_path, response)
-            logger.info(f"PRD saved to: {prd_path}")
-        except Exception as e:
-            logger.error(f"Failed to save PRD: {e}")
-            # Continue anyway, the content is in memory
+        # An unchanged PRD is already on disk
+        unchanged = (
+            same_content
+            and state.get("prd_file_path") == str(prd_path)
+            and prd_path.is_file()
+        )
+        files_to_write = {}
+        if unchanged:
+            logger.info(f"PRD unchanged, keeping: {prd_path}")
+        else:
+            files_to_write[prd_path.name] = response
 
         # Check if this is a revision based on reviews
         reviews = state.get("prd_reviews", {})
@@ -104,13 +131,10 @@ class PMAgent(LLMAgent):
 
         # Extract revision summary if present (when revising based on reviews)
         revision_summary = ""
+        # Two substring scans are cheaper than one regex scan when no header is present
         if "# PRD 修订说明" in response or "# PRD Revision" in response:
             # Extract the revision summary section
-            summary_match = re.search(
-                r"# (PRD 修订说明|PRD Revision)\s*\n## (主要变更内容|Major Changes)\s*\n(.*?)(?=\n##|$)",
-                response,
-                re.DOTALL | re.MULTILINE
-            )
+            summary_match = _REVISION_SUMMARY_RE.search(response)
             if summary_match:
                 revision_summary = summary_match.group(3).strip()
                 logger.info(f"Extracted revision summary: {revision_summary[:100]}...")
@@ -119,12 +143,11 @@ class PMAgent(LLMAgent):
         reviews_path = ""
         if reviews and len(reviews) == 3:
             reviews_path = workspace / "PRD_Reviews.md"
-            reviews_content = self._format_reviews_for_file(reviews)
-            try:
-                write_file(reviews_path, reviews_content)
-                logger.info(f"PRD reviews saved to: {reviews_path}")
-            except Exception as e:
-                logger.error(f"Failed to save PRD reviews: {e}")
+            files_to_write[reviews_path.name] = self._format_reviews_for_file(reviews)
+
+        # PRD and reviews go out as one background write; the content is in memory either way
+        if files_to_write:
+            submit_write(write_files, workspace, files_to_write)
 
         # Update state
         updates = {
@@ -165,22 +188,35 @@ class PMAgent(LLMAgent):
         Returns:
             Formatted markdown string
         """
-        role_names = {
-            "pm": "产品经理",
-            "dev": "开发工程师",
-            "qa": "测试工程师",
-        }
+        parts = [_REVIEWS_FILE_HEADER.format(timestamp=format_timestamp())]
+        for role, review in reviews.items():
+            parts.extend((f"## {_REVIEWER_ROLE_NAMES.get(role, role)}评审意见\n\n", review, "\n\n---\n\n"))
 
-        output = "# PRD 评审意见汇总\n\n"
-        output += f"评审时间: {__import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-        output += "---\n\n"
+        return "".join(parts)
+
+
+# Global PM agent instance, reused across graph ticks
+_pm_agent: Optional[PMAgent] = None
+
+
+def get_pm_agent() -> PMAgent:
+    """Get or create the global PM agent.
+
+    The agent is rebuilt when the global settings have been replaced.
+
+    Returns:
+        PMAgent instance
+    """
+    global _pm_agent
+    if _pm_agent is None or _pm_agent.settings is not get_settings():
+        _pm_agent = PMAgent()
+    return _pm_agent
 
-        for role, review in reviews.items():
-            output += f"## {role_names.get(role, role)}评审意见\n\n"
-            output += review
-            output += "\n\n---\n\n"
 
-        return output
+def reset_pm_agent() -> None:
+    """Reset the global PM agent instance (useful for testing)."""
+    global _pm_agent
+    _pm_agent = None
 
 
 def pm_agent_node(state: AgentState) -> Dict[str, Any]:
@@ -194,11 +230,9 @@ def pm_agent_node(state: AgentState) -> Dict[str, Any]:
     Returns:
         Dictionary of state updates
     """
-    logger.info("=" * 60)
-    logger.info("PM Agent Node Invoked")
-    logger.info("=" * 60)
+    logger.info("%s\nPM Agent Node Invoked\n%s", _BANNER, _BANNER)
 
-    agent = PMAgent()
+    agent = get_pm_agent()
     return agent.execute(state)
 
 
@@ -211,9 +245,7 @@ def pm_revision_node(state: AgentState) -> Dict[str, Any]:
     Returns:
         Dictionary of state updates
     """
-    logger.info("=" * 60)
-    logger.info("PM Revision Node Invoked")
-    logger.info("=" * 60)
+    logger.info("%s\nPM Revision Node Invoked\n%s", _BANNER, _BANNER)
 
     # Check if there's feedback to process
     feedback = state.get("prd_feedback", "")
@@ -221,7 +253,7 @@ def pm_revision_node(state: AgentState) -> Dict[str, Any]:
         logger.info("No PRD feedback, skipping revision")
         return {}
 
-    agent = PMAgent()
+    agent = get_pm_agent()
     return agent.execute(state)
 
 
@@ -1,11 +1,12 @@
 """PRD Reviewer Agents for multi-perspective PRD evaluation.
 
-This module contains three reviewer agents:
+One reviewer agent class is configured per role:
 - PM Reviewer: Reviews from product management perspective
 - Dev Reviewer: Reviews from technical implementation perspective
 - QA Reviewer: Reviews from testing and quality perspective
 """
 
+import asyncio
 from typing import Any, Dict
 
 from ..core.state import AgentState
@@ -20,11 +21,13 @@ from ..config.prompts import (
 )
 from ..tools.file_ops import write_file
 from ..utils.logger import get_logger
-from ..utils.helpers import generate_session_id
+from ..utils.helpers import gather_with_concurrency, generate_session_id
 
 
 logger = get_logger()
 
+_BANNER = "=" * 60
+
 
 class PRDReviewerAgent(LLMAgent):
     """Base class for PRD reviewer agents."""
@@ -41,7 +44,8 @@ class PRDReviewerAgent(LLMAgent):
         super().__init__(
             name=f"PRD_Reviewer_{role.upper()}",
             model_config=settings.pm_model,
-            system_prompt=system_prompt
+            system_prompt=system_prompt,
+            settings=settings
         )
         self.role = role
 
@@ -73,55 +77,47 @@ class PRDReviewerAgent(LLMAgent):
         """
         logger.info(f"Parsing PRD review response from {self.role} reviewer")
 
-        # Store review in prd_reviews
-        prd_reviews = state.get("prd_reviews", {})
-        prd_reviews[self.role] = response
-
+        # Only this reviewer's entry; the prd_reviews reducer merges it with the others
         return {
-            "prd_reviews": prd_reviews,
+            "prd_reviews": {self.role: response},
         }
 
 
-class PMReviewerAgent(PRDReviewerAgent):
-    """Product Manager PRD reviewer.
-
-    Reviews from product management perspective, focusing on:
-    - Requirement completeness
-    - User value
-    - Business logic
-    - User experience
-    """
-
-    def __init__(self):
-        super().__init__("pm", PRD_REVIEWER_PM_SYSTEM_PROMPT)
-
+# Reviewer system prompt per role:
+# - pm: requirement completeness, user value, business logic, user experience
+# - dev: technical feasibility, implementation complexity, technical risks, design rationality
+# - qa: testability, test coverage, quality standards, defect prevention
+_REVIEWER_SYSTEM_PROMPTS: Dict[str, str] = {
+    "pm": PRD_REVIEWER_PM_SYSTEM_PROMPT,
+    "dev": PRD_REVIEWER_DEV_SYSTEM_PROMPT,
+    "qa": PRD_REVIEWER_QA_SYSTEM_PROMPT,
+}
 
-class DevReviewerAgent(PRDReviewerAgent):
-    """Developer PRD reviewer.
+# Global reviewer agent instances keyed by role, reused across graph ticks
+_reviewer_agents: Dict[str, PRDReviewerAgent] = {}
 
-    Reviews from technical implementation perspective, focusing on:
-    - Technical feasibility
-    - Implementation complexity
-    - Technical risks
-    - Design rationality
-    """
 
-    def __init__(self):
-        super().__init__("dev", PRD_REVIEWER_DEV_SYSTEM_PROMPT)
+def get_reviewer_agent(role: str) -> PRDReviewerAgent:
+    """Get or create the global reviewer agent for a role.
 
+    The agent is rebuilt when the global settings have been replaced.
 
-class QAReviewerAgent(PRDReviewerAgent):
-    """QA Engineer PRD reviewer.
+    Args:
+        role: Reviewer role ("pm", "dev", "qa")
 
-    Reviews from testing and quality perspective, focusing on:
-    - Testability
-    - Test coverage
-    - Quality standards
-    - Defect prevention
+    Returns:
+        PRDReviewerAgent instance
     """
+    agent = _reviewer_agents.get(role)
+    if agent is None or agent.settings is not get_settings():
+        agent = PRDReviewerAgent(role, _REVIEWER_SYSTEM_PROMPTS[role])
+        _reviewer_agents[role] = agent
+    return agent
+
 
-    def __init__(self):
-        super().__init__("qa", PRD_REVIEWER_QA_SYSTEM_PROMPT)
+def reset_reviewer_agents() -> None:
+    """Reset the global reviewer agent instances (useful for testing)."""
+    _reviewer_agents.clear()
 
 
 def pm_reviewer_node(state: AgentState) -> Dict[str, Any]:
@@ -133,11 +129,9 @@ def pm_reviewer_node(state: AgentState) -> Dict[str, Any]:
     Returns:
         Dictionary of state updates
     """
-    logger.info("=" * 60)
-    logger.info("PM Reviewer Node Invoked")
-    logger.info("=" * 60)
+    logger.info("%s\nPM Reviewer Node Invoked\n%s", _BANNER, _BANNER)
 
-    agent = PMReviewerAgent()
+    agent = get_reviewer_agent("pm")
     return agent.execute(state)
 
 
@@ -150,11 +144,9 @@ def dev_reviewer_node(state: AgentState) -> Dict[str, Any]:
     Returns:
         Dictionary of state updates
     """
-    logger.info("=" * 60)
-    logger.info("Dev Reviewer Node Invoked")
-    logger.info("=" * 60)
+    logger.info("%s\nDev Reviewer Node Invoked\n%s", _BANNER, _BANNER)
 
-    agent = DevReviewerAgent()
+    agent = get_reviewer_agent("dev")
     return agent.execute(state)
 
 
@@ -167,9 +159,38 @@ def qa_reviewer_node(state: AgentState) -> Dict[str, Any]:
     Returns:
         Dictionary of state updates
     """
-    logger.info("=" * 60)
-    logger.info("QA Reviewer Node Invoked")
-    logger.info("=" * 60)
+    logger.info("%s\nQA Reviewer Node Invoked\n%s", _BANNER, _BANNER)
 
-    agent = QAReviewerAgent()
+    agent = get_reviewer_agent("qa")
     return agent.execute(state)
+
+
+def prd_reviewers_node(state: AgentState) -> Dict[str, Any]:
+    """LangGraph node that runs the PM, Dev and QA reviewers concurrently.
+
+    The reviews are independent and only read the PRD, so their LLM calls
+    overlap and the node takes about as long as the slowest reviewer.
+
+    Args:
+        state: Current agent state
+
+    Returns:
+        Dictionary of state updates with the new reviews by role
+    """
+    logger.info("%s\nPRD Reviewers Node Invoked\n%s", _BANNER, _BANNER)
+
+    agents = [get_reviewer_agent(role) for role in _REVIEWER_SYSTEM_PROMPTS]
+    limit = get_settings().agent.max_concurrent_llm_requests
+    results = asyncio.run(gather_with_concurrency(limit, *(agent.aexecute(state) for agent in agents)))
+
+    prd_reviews: Dict[str, str] = {}
+    errors = []
+    for result in results:
+        prd_reviews.update(result.get("prd_reviews", {}))
+        if result.get("error"):
+            errors.append(result["error"])
+
+    updates: Dict[str, Any] = {"prd_reviews": prd_reviews}
+    if errors:
+        updates["error"] = "; ".join(errors)
+    return updates
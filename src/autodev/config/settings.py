@@ -6,9 +6,13 @@ from typing import Optional
 from dataclasses import dataclass, field
 from dotenv import load_dotenv
 
+from ..utils.logger import get_logger
+
 # Load environment variables from .env file
 load_dotenv()
 
+logger = get_logger()
+
 
 @dataclass
 class ModelConfig:
@@ -26,11 +30,14 @@ class ClaudeCLIConfig:
     """Configuration for Claude Code CLI wrapper."""
 
     claude_cli_path: str = "claude"
+    model: Optional[str] = None  # 传给 claude --model；为空时使用 CLI 默认模型
     timeout: int = 300
     max_retries: int = 3
     retry_delay: float = 1.0
     enable_stream_output: bool = True
+    persistent_session: bool = False  # 复用常驻 claude 进程（批量模式每个并行槽一个，单任务模式跨节点复用；任务共享同一会话上下文）
     heartbeat_interval: int = 30
+    output_tail_lines: int = 500  # 流式模式下保留的 stdout 末尾行数
     validation_mode: str = "lenient"  # "strict" or "lenient"
 
 
@@ -52,6 +59,11 @@ class AgentConfig:
     human_in_loop: bool = False  # 默认不启用人工审核，可通过命令行参数或环境变量启用
     enable_checkpointing: bool = True
     checkpoint_backend: str = "sqlite"  # or "memory"
+    max_concurrent_llm_requests: int = 8  # 并发 LLM 请求上限，应与推理服务的 max-num-seqs 匹配
+    architect_structured_output: bool = False  # 架构师使用 schema 约束的结构化输出（失败时回退到自由文本解析）
+    max_parallel_tasks: int = 1  # 批量模式下同时执行的编码任务数（依赖已满足的任务才会并行）
+    llm_response_cache_size: int = 0  # 完全相同的请求复用最近的 LLM 响应（如失败后重跑），默认 0 表示关闭；开启后重试会得到相同响应
+    prompt_caching: bool = True  # 将系统提示词标记为提示词缓存断点（端点不支持 cache_control 时关闭）
 
 
 @dataclass
@@ -100,6 +112,17 @@ class Settings:
             self.architect_model.base_url = base_url
             self.coder_model.base_url = base_url
 
+        # Per-agent base URLs take precedence, so architect/coder traffic can be
+        # routed to a dedicated (e.g. self-hosted, continuously batched) endpoint
+        if pm_base_url := os.getenv("PM_BASE_URL"):
+            self.pm_model.base_url = pm_base_url
+
+        if architect_base_url := os.getenv("ARCHITECT_BASE_URL"):
+            self.architect_model.base_url = architect_base_url
+
+        if coder_base_url := os.getenv("CODER_BASE_URL"):
+            self.coder_model.base_url = coder_base_url
+
         if default_model := os.getenv("DEFAULT_MODEL"):
             self.default_model.model = default_model
 
@@ -118,6 +141,9 @@ class Settings:
         if data_root := os.getenv("DATA_ROOT"):
             self.workspace.data_root = data_root
 
+        if cli_model := os.getenv("CLAUDE_CLI_MODEL"):
+            self.claude_cli.model = cli_model
+
         if timeout := os.getenv("CLAUDE_CLI_TIMEOUT"):
             self.claude_cli.timeout = int(timeout)
 
@@ -127,9 +153,15 @@ class Settings:
         if stream_output := os.getenv("CLAUDE_CLI_STREAM_OUTPUT"):
             self.claude_cli.enable_stream_output = stream_output.lower() in ("true", "1", "yes")
 
+        if persistent_session := os.getenv("CLAUDE_CLI_PERSISTENT_SESSION"):
+            self.claude_cli.persistent_session = persistent_session.lower() in ("true", "1", "yes")
+
         if heartbeat_interval := os.getenv("CLAUDE_CLI_HEARTBEAT_INTERVAL"):
             self.claude_cli.heartbeat_interval = int(heartbeat_interval)
 
+        if output_tail_lines := os.getenv("CLAUDE_CLI_OUTPUT_TAIL_LINES"):
+            self.claude_cli.output_tail_lines = int(output_tail_lines)
+
         if validation_mode := os.getenv("CLAUDE_CLI_VALIDATION_MODE"):
             validation_mode = validation_mode.lower()
             if validation_mode in ("strict", "lenient"):
@@ -143,6 +175,21 @@ class Settings:
         if human_in_loop := os.getenv("HUMAN_IN_LOOP"):
             self.agent.human_in_loop = human_in_loop.lower() in ("true", "1", "yes")
 
+        if max_concurrent := os.getenv("MAX_CONCURRENT_LLM_REQUESTS"):
+            self.agent.max_concurrent_llm_requests = int(max_concurrent)
+
+        if structured := os.getenv("ARCHITECT_STRUCTURED_OUTPUT"):
+            self.agent.architect_structured_output = structured.lower() in ("true", "1", "yes")
+
+        if max_parallel := os.getenv("MAX_PARALLEL_TASKS"):
+            self.agent.max_parallel_tasks = int(max_parallel)
+
+        if response_cache_size := os.getenv("LLM_RESPONSE_CACHE_SIZE"):
+            self.agent.llm_response_cache_size = int(response_cache_size)
+
+        if prompt_caching := os.getenv("PROMPT_CACHING"):
+            self.agent.prompt_caching = prompt_caching.lower() in ("true", "1", "yes")
+
         if log_level := os.getenv("LOG_LEVEL"):
             self.logging.level = log_level
 
@@ -217,6 +264,10 @@ _settings: Optional[Settings] = None
 def get_settings() -> Settings:
     """Get the global settings instance.
 
+    Settings are read from the environment and validated only on the first
+    call; later calls return the cached instance, so hot paths may call this
+    freely. Use reset_settings() to force a reload.
+
     Returns:
         Global settings (creates one if doesn't exist)
 
@@ -1,8 +1,10 @@
 """Checkpoint management for LangGraph workflow persistence."""
 
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Any, Iterator, Optional
 
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.checkpoint.sqlite import SqliteSaver
@@ -15,6 +17,100 @@ from ..utils.helpers import ensure_directory
 logger = get_logger()
 
 
+# Tuning shared by the writer and reader connections:
+# - busy_timeout: wait up to 30s for a lock instead of failing with SQLITE_BUSY
+# - cache_size: 64 MiB page cache (negative value = KiB)
+# - temp_store: keep temporary tables/indices in memory
+# - mmap_size: read up to 256 MiB of the database through mmap
+_CONNECTION_PRAGMAS = (
+    "PRAGMA busy_timeout=30000;"
+    "PRAGMA cache_size=-64000;"
+    "PRAGMA temp_store=MEMORY;"
+    "PRAGMA mmap_size=268435456;"
+)
+
+
+class PooledSqliteSaver(SqliteSaver):
+    """SqliteSaver with one shared writer and a read-only connection per thread.
+
+    SqliteSaver funnels every query through one connection guarded by a
+    lock, so reading a session's state waits behind another session's
+    checkpoint write. Here the latest-checkpoint lookups (get_tuple and
+    get_delta_channel_history) run on a per-thread read-only connection
+    without taking that lock; under WAL they read the last committed state
+    while the writer commits. Writes and list() stay on the shared writer
+    connection, since list() also queries ``self.conn`` directly.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, db_path: Path, **kwargs: Any):
+        """Initialize the saver.
+
+        Args:
+            conn: Writer connection (shared across threads)
+            db_path: Database file, opened read-only for the reader connections
+            **kwargs: Passed on to SqliteSaver
+        """
+        super().__init__(conn, **kwargs)
+        self._reader_uri = f"{db_path.resolve().as_uri()}?mode=ro"
+        self._local = threading.local()
+
+    def _reader(self) -> sqlite3.Connection:
+        """Get this thread's read-only connection, opening it on first use.
+
+        Returns:
+            Read-only SQLite connection
+        """
+        reader = getattr(self._local, "conn", None)
+        if reader is None:
+            # Tables must exist before a read-only connection can query them
+            with self.lock:
+                self.setup()
+            reader = sqlite3.connect(self._reader_uri, uri=True)
+            reader.executescript(_CONNECTION_PRAGMAS)
+            self._local.conn = reader
+        return reader
+
+    @contextmanager
+    def cursor(self, transaction: bool = True) -> Iterator[sqlite3.Cursor]:
+        """Get a cursor: the thread's reader inside a read method, else the writer.
+
+        Args:
+            transaction: Whether to commit when the cursor is closed (writer only)
+
+        Yields:
+            SQLite cursor
+        """
+        if transaction or not getattr(self._local, "reading", False):
+            with super().cursor(transaction) as cur:
+                yield cur
+            return
+
+        cur = self._reader().cursor()
+        try:
+            yield cur
+        finally:
+            cur.close()
+
+    @contextmanager
+    def _reading(self) -> Iterator[None]:
+        """Route this thread's read cursors to its reader connection."""
+        self._local.reading = True
+        try:
+            yield
+        finally:
+            self._local.reading = False
+
+    def get_tuple(self, config):
+        """Get a checkpoint tuple, reading through this thread's reader connection."""
+        with self._reading():
+            return super().get_tuple(config)
+
+    def get_delta_channel_history(self, **kwargs: Any):
+        """Get delta channel history, reading through this thread's reader connection."""
+        with self._reading():
+            return super().get_delta_channel_history(**kwargs)
+
+
 class CheckpointManager:
     """Manager for LangGraph checkpointing.
 
@@ -28,8 +124,9 @@ class CheckpointManager:
             backend: Checkpoint backend ("memory" or "sqlite")
                     Defaults to settings value
         """
-        settings = get_settings()
-        self.backend = backend or settings.agent.checkpoint_backend
+        self._settings = get_settings()
+        self._checkpoints_dir: Optional[Path] = None
+        self.backend = backend or self._settings.agent.checkpoint_backend
         self.checkpointer = self._create_checkpointer()
 
         logger.info(f"Initialized checkpoint manager with backend: {self.backend}")
@@ -48,20 +145,14 @@ class CheckpointManager:
                 logger.warning(f"Checkpoint backend '{self.backend}' not supported, using 'memory'")
             return MemorySaver()
 
-    def _create_sqlite_checkpointer(self) -> SqliteSaver:
+    def _create_sqlite_checkpointer(self) -> PooledSqliteSaver:
         """Create an SQLite checkpointer.
 
         Returns:
-            SqliteSaver instance
+            PooledSqliteSaver instance
         """
-        settings = get_settings()
-
-        # Create checkpoints directory in data folder (与 workspace 平级)
-        data_dir = settings.get_data_directory()
-        checkpoints_dir = ensure_directory(data_dir / "checkpoints")
-
         # Database path
-        db_path = checkpoints_dir / "checkpoints.db"
+        db_path = self._get_checkpoints_dir() / "checkpoints.db"
 
         logger.info(f"Using SQLite checkpoint database: {db_path}")
 
@@ -71,8 +162,13 @@ class CheckpointManager:
         # Enable WAL mode for better concurrency
         conn.execute("PRAGMA journal_mode=WAL")
         conn.execute("PRAGMA synchronous=NORMAL")
+        # wal_autocheckpoint: checkpoint every 1000 pages, so the WAL stays bounded
+        # instead of growing until one slow COMMIT has to checkpoint it all
+        conn.executescript(_CONNECTION_PRAGMAS + "PRAGMA wal_autocheckpoint=1000;")
 
-        return SqliteSaver(conn)
+        # The default serializer already encodes channel values with ormsgpack
+        # (a C extension); orjson is no faster here and would turn tuples into lists.
+        return PooledSqliteSaver(conn, db_path)
 
     def get_checkpointer(self):
         """Get the checkpointer instance.
@@ -91,10 +187,19 @@ class CheckpointManager:
         Returns:
             Path to checkpoint directory
         """
-        settings = get_settings()
-        data_dir = settings.get_data_directory()
-        checkpoints_dir = ensure_directory(data_dir / "checkpoints")
-        return checkpoints_dir / session_id
+        return self._get_checkpoints_dir() / session_id
+
+    def _get_checkpoints_dir(self) -> Path:
+        """Get the checkpoints directory, creating it on first use.
+
+        Returns:
+            Path to the checkpoints directory
+        """
+        if self._checkpoints_dir is None:
+            # Create checkpoints directory in data folder (与 workspace 平级)
+            data_dir = self._settings.get_data_directory()
+            self._checkpoints_dir = ensure_directory(data_dir / "checkpoints")
+        return self._checkpoints_dir
 
 
 # Global checkpoint manager instance
@@ -1,24 +1,42 @@
 """LangGraph workflow definition for the multi-agent system."""
 
-from typing import Literal, Optional, Any, Dict
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Literal, Optional, Any, Dict, Tuple
 from pathlib import Path
 
 from langgraph.graph import StateGraph, END
 
 from .state import AgentState, create_initial_state
 from .checkpoint_manager import get_checkpointer
-from ..agents.pm_agent import pm_agent_node
-from ..agents.architect_agent import architect_agent_node
-from ..agents.coder_agent import coder_agent_node, check_coding_finished, coder_batch_node
-from ..agents.prd_reviewer_agents import pm_reviewer_node, dev_reviewer_node, qa_reviewer_node
 from ..config.settings import get_settings
 from ..utils.logger import get_logger
 from ..utils.helpers import generate_session_id
-from ..tools.file_ops import read_file, parse_tasks_json
+from ..tools.file_ops import read_file, parse_tasks_json, wait_for_pending_writes
 
 
 logger = get_logger()
 
+# Stream node-level deltas rather than the full accumulated state on every step;
+# the final state is read from the checkpointer once streaming ends
+_STREAM_MODE = "updates"
+
+
+def _stage_from_update(event: Dict[str, Any], stage: str) -> str:
+    """Get the stage after a streamed ``updates`` event.
+
+    Args:
+        event: Mapping of node name to the state update it returned
+        stage: Stage before the event
+
+    Returns:
+        The stage set by the event's updates, or ``stage`` if none set it
+    """
+    for update in event.values():
+        if isinstance(update, dict) and "stage" in update:
+            stage = update["stage"]
+    return stage
+
 
 def reconstruct_state_from_workspace(session_id: str) -> Optional[Dict[str, Any]]:
     """Reconstruct state from workspace files when checkpoint is not available.
@@ -29,6 +47,7 @@ def reconstruct_state_from_workspace(session_id: str) -> Optional[Dict[str, Any]
     Returns:
         Reconstructed state dictionary or None if workspace not found
     """
+    wait_for_pending_writes()
     settings = get_settings()
     workspace = settings.get_session_workspace(session_id)
 
@@ -40,11 +59,22 @@ def reconstruct_state_from_workspace(session_id: str) -> Optional[Dict[str, Any]
     state = create_initial_state("", session_id)
     state["session_id"] = session_id
 
-    # Check for PRD
+    # Read the artifacts that exist concurrently; the reads are independent I/O
     prd_path = workspace / "PRD.md"
-    if prd_path.exists():
+    design_path = workspace / "Design.md"
+    tasks_path = workspace / "tasks.json"
+    loaders = [(prd_path, read_file), (design_path, read_file), (tasks_path, parse_tasks_json)]
+    with ThreadPoolExecutor(max_workers=len(loaders)) as pool:
+        futures = {
+            path: pool.submit(load, path)
+            for path, load in loaders
+            if path.exists()
+        }
+
+    # Check for PRD
+    if prd_path in futures:
         try:
-            prd_content = read_file(prd_path)
+            prd_content = futures[prd_path].result()
             state["prd_content"] = prd_content
             state["prd_file_path"] = str(prd_path)
             state["prd_iteration"] = 1
@@ -54,10 +84,9 @@ def reconstruct_state_from_workspace(session_id: str) -> Optional[Dict[str, Any]
             logger.error(f"Failed to read PRD: {e}")
 
     # Check for Design
-    design_path = workspace / "Design.md"
-    if design_path.exists():
+    if design_path in futures:
         try:
-            design_content = read_file(design_path)
+            design_content = futures[design_path].result()
             state["design_content"] = design_content
             state["design_file_path"] = str(design_path)
             state["design_iteration"] = 1
@@ -67,10 +96,9 @@ def reconstruct_state_from_workspace(session_id: str) -> Optional[Dict[str, Any]
             logger.error(f"Failed to read Design: {e}")
 
     # Check for tasks
-    tasks_path = workspace / "tasks.json"
-    if tasks_path.exists():
+    if tasks_path in futures:
         try:
-            tasks = parse_tasks_json(tasks_path)
+            tasks = futures[tasks_path].result()
             state["task_list"] = tasks
             logger.info(f"Reconstructed {len(tasks)} tasks from: {tasks_path}")
         except Exception as e:
@@ -92,6 +120,12 @@ def reconstruct_state_from_workspace(session_id: str) -> Optional[Dict[str, Any]
     return state
 
 
+# Compiled workflows by (human_in_loop, batch_coding, enable_prd_review), each
+# stored with the checkpointer it was compiled against
+_compiled_workflows: Dict[Tuple[bool, bool, bool], Tuple[Any, StateGraph]] = {}
+_compiled_workflows_lock = threading.Lock()
+
+
 def build_workflow(
     human_in_loop: bool = True,
     batch_coding: bool = False,
@@ -99,14 +133,60 @@ def build_workflow(
 ) -> StateGraph:
     """Build the LangGraph workflow for the multi-agent system.
 
+    The graph topology depends only on the three flags, so the compiled
+    graph is cached and shared by all sessions (they are kept apart by
+    thread_id). A cached graph is reused only while it was compiled against
+    the current checkpointer, so resetting the checkpoint manager rebuilds it.
+
+    Args:
+        human_in_loop: Whether to include human interrupt points
+        batch_coding: Whether to execute all coding tasks at once
+        enable_prd_review: Whether to enable PRD review by reviewers
+
+    Returns:
+        Compiled StateGraph ready for execution
+    """
+    key = (human_in_loop, batch_coding, enable_prd_review)
+    checkpointer = get_checkpointer()
+    with _compiled_workflows_lock:
+        cached = _compiled_workflows.get(key)
+        if cached is not None and cached[0] is checkpointer:
+            return cached[1]
+
+        compiled = _compile_workflow(human_in_loop, batch_coding, enable_prd_review, checkpointer)
+        _compiled_workflows[key] = (checkpointer, compiled)
+        return compiled
+
+
+def reset_workflow_cache() -> None:
+    """Drop all cached compiled workflows (useful for testing)."""
+    with _compiled_workflows_lock:
+        _compiled_workflows.clear()
+
+
+def _compile_workflow(
+    human_in_loop: bool,
+    batch_coding: bool,
+    enable_prd_review: bool,
+    checkpointer: Any
+) -> StateGraph:
+    """Build and compile the workflow graph.
+
     Args:
         human_in_loop: Whether to include human interrupt points
         batch_coding: Whether to execute all coding tasks at once
         enable_prd_review: Whether to enable PRD review by reviewers
+        checkpointer: Checkpointer to compile the graph with
 
     Returns:
         Compiled StateGraph ready for execution
     """
+    # Agent modules are only needed once a graph is actually built
+    from ..agents.pm_agent import pm_agent_node
+    from ..agents.architect_agent import architect_agent_node, check_task_dependencies
+    from ..agents.coder_agent import coder_agent_node, check_coding_finished, coder_batch_node
+    from ..agents.prd_reviewer_agents import prd_reviewers_node
+
     logger.info("Building LangGraph workflow")
 
     # Create the state graph
@@ -116,10 +196,8 @@ def build_workflow(
     workflow.add_node("pm", pm_agent_node)
 
     if enable_prd_review:
-        # Add PRD reviewer nodes
-        workflow.add_node("pm_reviewer", pm_reviewer_node)
-        workflow.add_node("dev_reviewer", dev_reviewer_node)
-        workflow.add_node("qa_reviewer", qa_reviewer_node)
+        # PM, Dev and QA reviewers run concurrently in one node
+        workflow.add_node("prd_reviewers", prd_reviewers_node)
         workflow.add_node("pm_revise", pm_agent_node)  # PM revises based on reviews
 
     workflow.add_node("architect", architect_agent_node)
@@ -136,18 +214,25 @@ def build_workflow(
 
     # Define edges between nodes
     if enable_prd_review:
-        # PRD Review flow: PM -> PM Reviewer -> Dev Reviewer -> QA Reviewer -> PM Revise -> Architect
-        workflow.add_edge("pm", "pm_reviewer")
-        workflow.add_edge("pm_reviewer", "dev_reviewer")
-        workflow.add_edge("dev_reviewer", "qa_reviewer")
-        workflow.add_edge("qa_reviewer", "pm_revise")
+        # PRD Review flow: PM -> Reviewers (PM, Dev, QA in parallel) -> PM Revise -> Architect
+        workflow.add_edge("pm", "prd_reviewers")
+        workflow.add_edge("prd_reviewers", "pm_revise")
         workflow.add_edge("pm_revise", "architect")
     else:
         # Direct flow: PM -> Architect
         workflow.add_edge("pm", "architect")
 
-    # Architect -> Coder (always proceeds after design is generated)
-    workflow.add_edge("architect", "coder")
+    # Architect -> Coder, unless the task list has circular dependencies
+    # or the design document could not be written
+    workflow.add_conditional_edges(
+        "architect",
+        check_task_dependencies,
+        {
+            "valid": "coder",
+            "has_cycle": END,
+            "write_failed": END
+        }
+    )
 
     # Coder loop
     if not batch_coding:
@@ -165,9 +250,6 @@ def build_workflow(
         workflow.add_edge("coder", END)
 
     # Compile with checkpointer
-    checkpointer = get_checkpointer()
-    settings = get_settings()
-
     # Configure interrupt points for human-in-the-loop
     interrupt_before = []
     interrupt_after = []
@@ -270,39 +352,45 @@ def run_workflow_until_interrupt(
         step_count = 0
         state = initial_state
 
-        for event in workflow.stream(state, config, stream_mode="values"):
+        # Checkpoints are written on LangGraph's background thread while the next
+        # step runs (its default "async" durability); each write is already one
+        # short transaction, so wrapping a step in BEGIN/COMMIT would only hold
+        # the write lock across node execution
+        prev_stage = state.get('stage', 'unknown')
+        for event in workflow.stream(state, config, stream_mode=_STREAM_MODE):
             step_count += 1
-            current_stage = event.get('stage', 'unknown')
-            prev_stage = state.get('stage', 'unknown')
+            current_stage = _stage_from_update(event, prev_stage)
 
             # Log stage transitions
             if current_stage != prev_stage:
                 logger.info(f"-> 阶段转换: {prev_stage} -> {current_stage}")
+                prev_stage = current_stage
 
-            logger.info(f"Step {step_count}: 当前阶段 {current_stage}")
+            logger.info(f"Step {step_count}: 节点 {', '.join(event)} 当前阶段 {current_stage}")
 
             if step_count >= max_steps:
                 logger.warning(f"Reached max steps ({max_steps})")
                 break
 
-        # Get the final state
-        final_state = workflow.get_state(config).values
-        next_node = workflow.get_state(config).next
+        # Get the final state (one checkpointer read serves values, next and the return)
+        snapshot = workflow.get_state(config)
+        final_state = snapshot.values
+        next_node = snapshot.next
 
         # Check if we're interrupted
         if next_node:
             logger.info(f"Workflow interrupted before: {next_node}")
-            return final_state, "interrupted", workflow.get_state(config)
+            return final_state, "interrupted", snapshot
         else:
             logger.info("Workflow completed")
-            return final_state, "completed", workflow.get_state(config)
+            return final_state, "completed", snapshot
 
     except Exception as e:
         logger.error(f"Workflow error: {e}")
         # Try to get current state
         try:
-            current_state = workflow.get_state(config).values
-            return current_state, "error", workflow.get_state(config)
+            snapshot = workflow.get_state(config)
+            return snapshot.values, "error", snapshot
         except:
             return state, "error", None
 
@@ -342,7 +430,7 @@ def resume_workflow(
 
     if has_checkpoint:
         # Resume from checkpoint using the normal flow
-        return _resume_from_checkpoint(workflow, config, feedback)
+        return _resume_from_checkpoint(workflow, config, feedback, state_snapshot)
     else:
         # Resume from workspace files
         return _resume_from_workspace(workflow, session_id, config, feedback)
@@ -351,7 +439,8 @@ def resume_workflow(
 def _resume_from_checkpoint(
     workflow: StateGraph,
     config: Dict[str, Any],
-    feedback: Optional[str] = None
+    feedback: Optional[str] = None,
+    state_snapshot: Optional[Any] = None
 ) -> tuple[Dict[str, Any], str, Optional[Any]]:
     """Resume workflow from a valid checkpoint.
 
@@ -359,13 +448,16 @@ def _resume_from_checkpoint(
         workflow: Compiled StateGraph
         config: Workflow config with thread_id
         feedback: Optional feedback to provide
+        state_snapshot: Snapshot already read for this config, if any
 
     Returns:
         Tuple of (final_state, status, checkpoint)
     """
     try:
         # Get current state
-        current_state = workflow.get_state(config).values
+        if state_snapshot is None:
+            state_snapshot = workflow.get_state(config)
+        current_state = state_snapshot.values
         current_stage = current_state.get("stage", "unknown")
         logger.info(f"从检查点恢复工作流 (当前阶段: {current_stage})")
 
@@ -382,29 +474,30 @@ def _resume_from_checkpoint(
         # Resume execution (this will continue from the interrupt)
         # We need to invoke None to signal "continue"
         prev_stage = current_stage
-        for event in workflow.stream(None, config, stream_mode="values"):
-            new_stage = event.get('stage', 'unknown')
+        for event in workflow.stream(None, config, stream_mode=_STREAM_MODE):
+            new_stage = _stage_from_update(event, prev_stage)
             if new_stage != prev_stage:
                 logger.info(f"-> 阶段转换: {prev_stage} -> {new_stage}")
                 prev_stage = new_stage
-            logger.info(f"恢复进度: 当前阶段 {new_stage}")
+            logger.info(f"恢复进度: 节点 {', '.join(event)} 当前阶段 {new_stage}")
 
-        # Get the final state
-        final_state = workflow.get_state(config).values
-        next_node = workflow.get_state(config).next
+        # Get the final state (one checkpointer read serves values, next and the return)
+        snapshot = workflow.get_state(config)
+        final_state = snapshot.values
+        next_node = snapshot.next
 
         if next_node:
             logger.info(f"Workflow interrupted before: {next_node}")
-            return final_state, "interrupted", workflow.get_state(config)
+            return final_state, "interrupted", snapshot
         else:
             logger.info("Workflow completed")
-            return final_state, "completed", workflow.get_state(config)
+            return final_state, "completed", snapshot
 
     except Exception as e:
         logger.error(f"Workflow resume error: {e}")
         try:
-            current_state = workflow.get_state(config).values
-            return current_state, "error", workflow.get_state(config)
+            snapshot = workflow.get_state(config)
+            return snapshot.values, "error", snapshot
         except:
             return {}, "error", None
 
@@ -426,6 +519,9 @@ def _resume_from_workspace(
     Returns:
         Tuple of (final_state, status, checkpoint)
     """
+    from ..agents.architect_agent import architect_agent_node
+    from ..agents.coder_agent import coder_batch_node
+
     try:
         # Reconstruct state from workspace files
         current_state = reconstruct_state_from_workspace(session_id)
@@ -499,10 +595,8 @@ def _resume_from_workspace(
             current_state["stage"] = "done"
             return current_state, "completed", None
 
-    except Exception as e:
-        logger.error(f"Workspace resume error: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Workspace resume error")
         return {}, "error", None
 
 
@@ -1,9 +1,79 @@
 """Core state definition for the multi-agent system."""
 
-from typing import Any, Dict, List, Literal, TypedDict, Annotated
+from typing import Any, Dict, List, Literal, TypedDict, Annotated, Union
 from operator import add
 
 
+def merge_task_list(
+    current: List[Dict[str, Any]],
+    update: Union[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]
+) -> List[Dict[str, Any]]:
+    """Reducer for the task_list channel.
+
+    A list replaces the task list outright. A dict is treated as a patch
+    mapping task id to the fields that changed, so a node that touched one
+    task does not have to send the whole list back.
+
+    Args:
+        current: Current task list
+        update: New task list, or {task_id: {field: value}} patch
+
+    Returns:
+        Merged task list
+    """
+    if not isinstance(update, dict):
+        return update
+    merged = list(current or [])
+    remaining = len(update)
+    for i, task in enumerate(merged):
+        fields = update.get(task.get("id"))
+        if fields:
+            merged[i] = {**task, **fields}
+            remaining -= 1
+            if not remaining:
+                break
+    return merged
+
+
+def merge_completed_tasks(current: List[str], update: List[str]) -> List[str]:
+    """Reducer for the completed_tasks channel.
+
+    Appends IDs from the update that are not already present, so a node
+    can return just the task it finished and a repeated ID is never
+    recorded twice. Returning the full list is equivalent.
+
+    Args:
+        current: Completed task IDs so far
+        update: Newly completed task IDs (or the full list)
+
+    Returns:
+        Ordered union of both lists
+    """
+    if not current:
+        return list(update or [])
+    seen = set(current)
+    new_ids = [task_id for task_id in update or [] if task_id not in seen]
+    return current + new_ids if new_ids else current
+
+
+def merge_prd_reviews(current: Dict[str, str], update: Dict[str, str]) -> Dict[str, str]:
+    """Reducer for the prd_reviews channel.
+
+    Each reviewer returns only its own {role: review} entry, so reviewers
+    running in parallel branches do not overwrite each other.
+
+    Args:
+        current: Reviews collected so far
+        update: New or replaced reviews by role
+
+    Returns:
+        Merged reviews
+    """
+    if not update:
+        return current or {}
+    return {**(current or {}), **update}
+
+
 class AgentState(TypedDict):
     """State that flows through the LangGraph workflow.
 
@@ -27,8 +97,8 @@ class AgentState(TypedDict):
     """Number of PRD iteration cycles."""
 
     # PRD Review Phase
-    prd_reviews: Dict[str, str]
-    """PRD review feedback from different reviewers (pm, dev, qa)."""
+    prd_reviews: Annotated[Dict[str, str], merge_prd_reviews]
+    """PRD review feedback from different reviewers (pm, dev, qa), merged by role."""
     prd_reviews_file_path: str
     """Path to PRD reviews markdown file."""
     prd_reviewed: bool
@@ -47,9 +117,11 @@ class AgentState(TypedDict):
     """Number of design iteration cycles."""
 
     # Task Breakdown
-    task_list: List[Dict[str, Any]]
+    task_list: Annotated[List[Dict[str, Any]], merge_task_list]
     """List of atomic tasks generated by architect.
 
+    Nodes may return either a full list or a {task_id: fields} patch.
+
     Each task should have:
     - id: str - Unique task identifier
     - title: str - Task title
@@ -60,8 +132,10 @@ class AgentState(TypedDict):
     """
     current_task_index: int
     """Index of currently executing task in task_list."""
-    completed_tasks: List[str]
-    """List of completed task IDs."""
+    completed_tasks: Annotated[List[str], merge_completed_tasks]
+    """List of completed task IDs (nodes may return only the new ones)."""
+    task_cycle: List[str]
+    """Task IDs forming a dependency cycle, found by the architect (empty if none)."""
 
     # Code Generation Phase
     project_dir: str
@@ -152,6 +226,7 @@ def create_initial_state(requirement: str, session_id: str) -> AgentState:
         "task_list": [],
         "current_task_index": 0,
         "completed_tasks": [],
+        "task_cycle": [],
 
         # Code Generation Phase
         "project_dir": "",
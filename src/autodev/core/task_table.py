@@ -0,0 +1,209 @@
+"""Column-oriented view of a task list for repeated scans."""
+
+import heapq
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional
+
+
+class TaskTable:
+    """Task list stored as parallel columns.
+
+    The scheduler scans every task's ID, status and dependencies many times
+    per session. Keeping those fields in flat lists (with dependencies
+    pre-converted to frozensets) avoids repeated dict lookups on each scan.
+    The original task dicts stay the source of truth for the graph state:
+    :meth:`update` writes to both, so ``tasks`` is always current.
+    """
+
+    __slots__ = ("tasks", "ids", "statuses", "deps", "id_to_idx", "_successors")
+
+    def __init__(self, tasks: List[Dict[str, Any]]):
+        """Build the table from a list of task dictionaries.
+
+        Args:
+            tasks: List of task dictionaries (kept by reference)
+        """
+        self.tasks = tasks
+        self.ids: List[str] = [t["id"] for t in tasks]
+        self.statuses: List[str] = [t.get("status", "pending") for t in tasks]
+        self.deps: List[FrozenSet[str]] = [frozenset(t.get("dependencies") or ()) for t in tasks]
+        self.id_to_idx: Dict[str, int] = {task_id: i for i, task_id in enumerate(self.ids)}
+        self._successors: Optional[Dict[str, List[str]]] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def matches(self, tasks: List[Dict[str, Any]]) -> bool:
+        """Check whether the table still describes the given task list.
+
+        Args:
+            tasks: List of task dictionaries
+
+        Returns:
+            True if the table was built from this list and its length is unchanged
+        """
+        return self.tasks is tasks and len(self.ids) == len(tasks)
+
+    @property
+    def successors(self) -> Dict[str, List[str]]:
+        """Map each task ID to the IDs of the tasks that depend on it.
+
+        Built on first access and reused for the lifetime of the table.
+
+        Returns:
+            Dictionary of dependency ID to dependent task IDs
+        """
+        if self._successors is None:
+            successors: Dict[str, List[str]] = {}
+            for task_id, deps in zip(self.ids, self.deps):
+                for dep in deps:
+                    successors.setdefault(dep, []).append(task_id)
+            self._successors = successors
+        return self._successors
+
+    def topological_order(self) -> List[int]:
+        """Order tasks so every task comes after its dependencies (Kahn's algorithm).
+
+        Ties are broken by the original position, so an already valid
+        order is returned unchanged. Dependencies on unknown IDs impose no
+        ordering; tasks caught in a cycle are appended in original order.
+
+        Returns:
+            Task positions in execution order
+        """
+        id_to_idx = self.id_to_idx
+        in_degree = [sum(1 for dep in deps if dep in id_to_idx) for deps in self.deps]
+        heap = [i for i, degree in enumerate(in_degree) if degree == 0]
+        heapq.heapify(heap)
+        successors = self.successors
+        order: List[int] = []
+
+        while heap:
+            i = heapq.heappop(heap)
+            order.append(i)
+            for successor in successors.get(self.ids[i], ()):
+                j = id_to_idx[successor]
+                in_degree[j] -= 1
+                if in_degree[j] == 0:
+                    heapq.heappush(heap, j)
+
+        if len(order) < len(self.ids):
+            placed = set(order)
+            order.extend(i for i in range(len(self.ids)) if i not in placed)
+        return order
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Get a task dictionary by ID.
+
+        Args:
+            task_id: Task identifier
+
+        Returns:
+            Task dictionary or None if not found
+        """
+        idx = self.id_to_idx.get(task_id)
+        return None if idx is None else self.tasks[idx]
+
+    def update(self, task_id: str, fields: Dict[str, Any]) -> None:
+        """Apply field updates to a task, keeping the status column in sync.
+
+        Args:
+            task_id: Task identifier (ignored if unknown)
+            fields: Fields to set on the task dictionary
+        """
+        idx = self.id_to_idx.get(task_id)
+        if idx is None:
+            return
+        self.tasks[idx].update(fields)
+        if "status" in fields:
+            self.statuses[idx] = fields["status"]
+
+    def ready_indices(self, completed: Iterable[str]) -> List[int]:
+        """Get positions of tasks whose dependencies are all completed.
+
+        Args:
+            completed: IDs of completed tasks
+
+        Returns:
+            Positions of tasks that are neither completed nor blocked by dependencies
+        """
+        completed_set = completed if isinstance(completed, (set, frozenset)) else set(completed)
+        ids, statuses, deps = self.ids, self.statuses, self.deps
+        return [
+            i for i in range(len(ids))
+            if statuses[i] != "completed" and ids[i] not in completed_set
+            and (not deps[i] or deps[i] <= completed_set)
+        ]
+
+
+class TaskScheduler:
+    """Incremental ready-set over a :class:`TaskTable`.
+
+    Counts each pending task's unmet dependencies once, then keeps the
+    ready set up to date as tasks complete: :meth:`complete` only touches
+    the finished task's successors instead of rescanning the whole list.
+    Dependencies on unknown IDs are never satisfied.
+    """
+
+    __slots__ = ("table", "_pending_deps", "_ready")
+
+    def __init__(self, table: TaskTable, completed: Iterable[str]):
+        """Count unmet dependencies for every task that still needs to run.
+
+        Args:
+            table: Task table to schedule
+            completed: IDs of tasks that are already done
+        """
+        completed_set = completed if isinstance(completed, (set, frozenset)) else set(completed)
+        self.table = table
+        self._pending_deps: Dict[str, int] = {}
+        # Insertion-ordered set, so ready tasks come out in task list order
+        self._ready: Dict[str, None] = {}
+
+        for task_id, status, deps in zip(table.ids, table.statuses, table.deps):
+            if task_id in completed_set or status == "completed":
+                continue
+            pending = len(deps - completed_set) if deps else 0
+            self._pending_deps[task_id] = pending
+            if pending == 0:
+                self._ready[task_id] = None
+
+    def complete(self, task_id: str) -> List[str]:
+        """Mark a task completed and release the successors it was blocking.
+
+        Args:
+            task_id: ID of the completed task
+
+        Returns:
+            IDs of tasks that became ready because of this completion
+        """
+        self._ready.pop(task_id, None)
+        if self._pending_deps.pop(task_id, None) is None:
+            return []  # unknown or already completed
+
+        released: List[str] = []
+        pending_deps = self._pending_deps
+        for successor in self.table.successors.get(task_id, ()):
+            if successor not in pending_deps:
+                continue  # completed before this scheduler was built
+            pending_deps[successor] -= 1
+            if pending_deps[successor] == 0:
+                self._ready[successor] = None
+                released.append(successor)
+        return released
+
+    def ready_ids(self) -> List[str]:
+        """Get IDs of tasks whose dependencies are all completed.
+
+        Returns:
+            Ready task IDs, initially in task list order, then in release order
+        """
+        return list(self._ready)
+
+    def ready_tasks(self) -> List[Dict[str, Any]]:
+        """Get tasks whose dependencies are all completed.
+
+        Returns:
+            List of ready task dictionaries
+        """
+        get = self.table.get
+        return [get(task_id) for task_id in self._ready]
@@ -1,14 +1,19 @@
 """Claude Code CLI wrapper for executing coding tasks."""
 
+import asyncio
 import os
+import queue
 import subprocess
 import tempfile
 import threading
 import time
+from collections import deque
 from pathlib import Path
-from typing import Optional, List
+from typing import Deque, Optional, List
 from dataclasses import dataclass
 
+import orjson
+
 from ..config.settings import get_settings
 from ..utils.logger import get_logger
 from .validation import validate_coding_output
@@ -67,11 +72,18 @@ class ClaudeCLIWrapper:
         settings = get_settings()
 
         self.claude_path = claude_path or settings.claude_cli.claude_cli_path
+        self.model = settings.claude_cli.model
+        # Route the CLI to the coder endpoint, which may be served differently
+        # (e.g. with speculative decoding) from the architect/PM endpoints
+        self.env = None
+        if settings.coder_model.base_url:
+            self.env = {**os.environ, "ANTHROPIC_BASE_URL": settings.coder_model.base_url}
         self.timeout = timeout or settings.claude_cli.timeout
         self.max_retries = max_retries or settings.claude_cli.max_retries
         self.retry_delay = settings.claude_cli.retry_delay
         self.enable_stream_output = settings.claude_cli.enable_stream_output
         self.heartbeat_interval = settings.claude_cli.heartbeat_interval
+        self.output_tail_lines = settings.claude_cli.output_tail_lines
         self.validation_mode = validation_mode or settings.claude_cli.validation_mode
 
     def run(
@@ -139,6 +151,111 @@ class ClaudeCLIWrapper:
             error="Max retries exceeded"
         )
 
+    async def run_async(
+        self,
+        prompt: str,
+        work_dir: Optional[str] = None,
+        timeout: Optional[int] = None,
+        add_dir: Optional[str] = None
+    ) -> ClaudeCLIResult:
+        """Execute Claude Code CLI without blocking the event loop.
+
+        Same retry behaviour as :meth:`run`, but the process is driven by
+        asyncio, so many concurrent tasks do not each hold an OS thread.
+
+        Args:
+            prompt: Prompt to send to Claude Code
+            work_dir: Working directory for execution
+            timeout: Override default timeout
+            add_dir: Directory path(s) to add with --add-dir flag (string or list of strings)
+
+        Returns:
+            ClaudeCLIResult with execution details
+        """
+        actual_timeout = timeout or self.timeout
+        cmd = self._build_command(prompt, work_dir, True, add_dir)
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                logger.info(f"Executing Claude CLI (attempt {attempt + 1}/{self.max_retries + 1})")
+                result = await asyncio.wait_for(self._execute_async(cmd, work_dir), actual_timeout)
+
+                if result.success:
+                    logger.info("Claude CLI execution succeeded")
+                    return result
+                elif attempt < self.max_retries:
+                    logger.warning(f"Attempt {attempt + 1} failed, retrying...")
+                else:
+                    logger.error(f"All {self.max_retries + 1} attempts failed")
+                    return result
+
+            except asyncio.TimeoutError:
+                logger.warning(f"Timeout after {actual_timeout}s (attempt {attempt + 1})")
+                if attempt >= self.max_retries:
+                    return ClaudeCLIResult(
+                        success=False,
+                        output="",
+                        error=f"Timeout after {actual_timeout} seconds"
+                    )
+            except Exception as e:
+                logger.error(f"Unexpected error: {e}")
+                if attempt >= self.max_retries:
+                    return ClaudeCLIResult(
+                        success=False,
+                        output="",
+                        error=str(e)
+                    )
+
+        return ClaudeCLIResult(
+            success=False,
+            output="",
+            error="Max retries exceeded"
+        )
+
+    async def _execute_async(self, cmd: List[str], work_dir: Optional[str]) -> ClaudeCLIResult:
+        """Run the command as an asyncio subprocess, streaming stdout to the log.
+
+        The process is killed if the coroutine is cancelled (e.g. on timeout).
+
+        Args:
+            cmd: Command to execute
+            work_dir: Working directory
+
+        Returns:
+            ClaudeCLIResult with execution details
+        """
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=work_dir,
+            env=self.env,
+            limit=1024 * 1024  # allow long single-line outputs
+        )
+
+        output_lines: Deque[str] = deque(maxlen=self.output_tail_lines)
+        start_time = time.time()
+        stderr_task = asyncio.ensure_future(process.stderr.read())
+
+        try:
+            async for raw_line in process.stdout:
+                line = raw_line.decode("utf-8", errors="replace")
+                output_lines.append(line)
+                if self.enable_stream_output:
+                    logger.info(f"Claude CLI: {line.rstrip()}")
+            error_output = (await stderr_task).decode("utf-8", errors="replace")
+            exit_code = await process.wait()
+        finally:
+            if process.returncode is None:
+                stderr_task.cancel()
+                process.kill()
+                await process.wait()
+
+        elapsed_time = int(time.time() - start_time)
+        logger.info(f"Claude CLI 执行完成 (用时 {elapsed_time} 秒)")
+
+        return self._process_result("".join(output_lines), error_output, exit_code)
+
     def _build_command(
         self,
         prompt: str,
@@ -159,6 +276,9 @@ class ClaudeCLIWrapper:
         """
         cmd = [self.claude_path]
 
+        if self.model:
+            cmd.extend(["--model", self.model])
+
         # Add --add-dir if specified
         if add_dir:
             cmd.extend(["--add-dir", add_dir])
@@ -227,7 +347,8 @@ class ClaudeCLIWrapper:
             capture_output=True,
             text=True,
             timeout=timeout,
-            cwd=work_dir
+            cwd=work_dir,
+            env=self.env
         )
 
         output = result.stdout
@@ -261,11 +382,14 @@ class ClaudeCLIWrapper:
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=True,
-            cwd=work_dir
+            bufsize=1,
+            cwd=work_dir,
+            env=self.env
         )
 
-        output_lines = []
-        error_lines = []
+        # Only the tail of stdout is kept; every line is still logged as it arrives
+        output_lines: Deque[str] = deque(maxlen=self.output_tail_lines)
+        error_lines: List[str] = []
         start_time = time.time()
         stop_heartbeat = threading.Event()
 
@@ -278,35 +402,24 @@ class ClaudeCLIWrapper:
                 logger.info(f"Claude CLI 执行中... (已运行 {elapsed} 秒)")
                 stop_heartbeat.wait(self.heartbeat_interval)
 
+        # Drain stderr concurrently so a chatty stderr cannot block the process
+        def drain_stderr():
+            for line in process.stderr:
+                error_lines.append(line)
+
         heartbeat_thread = threading.Thread(target=heartbeat, daemon=True)
+        stderr_thread = threading.Thread(target=drain_stderr, daemon=True)
         heartbeat_thread.start()
+        stderr_thread.start()
 
         try:
-            # Stream output
-            while True:
-                # Check if process is still running
-                if process.poll() is not None:
-                    # Read any remaining output
-                    remaining_stdout, remaining_stderr = process.communicate()
-                    if remaining_stdout:
-                        output_lines.append(remaining_stdout)
-                    if remaining_stderr:
-                        error_lines.append(remaining_stderr)
-                    break
-
-                # Read available output with timeout
-                try:
-                    # Use readline with a small timeout to avoid blocking
-                    line = process.stdout.readline()
-                    if line:
-                        output_lines.append(line)
-                        # Stream to logger in real-time
-                        logger.info(f"Claude CLI: {line.rstrip()}")
-                    else:
-                        # No output available, small sleep
-                        time.sleep(0.1)
-                except:
-                    break
+            # Stream output line by line until EOF
+            for line in process.stdout:
+                output_lines.append(line)
+                # Stream to logger in real-time
+                logger.info(f"Claude CLI: {line.rstrip()}")
+            process.wait()
+            stderr_thread.join()
 
         finally:
             stop_heartbeat.set()
@@ -427,6 +540,38 @@ class ClaudeCLIWrapper:
         prompt = prompt_file.read_text()
         return self.run(prompt, work_dir, add_dir=add_dir)
 
+    def open_daemon(self, work_dir: Optional[str] = None, add_dir: Optional[str] = None) -> "ClaudeDaemon":
+        """Start a persistent Claude Code process for a series of prompts.
+
+        Args:
+            work_dir: Working directory for the process
+            add_dir: Directory to add with --add-dir flag
+
+        Returns:
+            Started ClaudeDaemon
+        """
+        daemon = ClaudeDaemon(self, work_dir, add_dir)
+        daemon.start()
+        return daemon
+
+    def open_daemon_pool(
+        self,
+        size: int,
+        work_dir: Optional[str] = None,
+        add_dir: Optional[str] = None
+    ) -> "ClaudeDaemonPool":
+        """Create a pool of persistent Claude Code processes.
+
+        Args:
+            size: Maximum number of processes (one per concurrent prompt)
+            work_dir: Working directory for the processes
+            add_dir: Directory to add with --add-dir flag
+
+        Returns:
+            ClaudeDaemonPool whose processes start on first use
+        """
+        return ClaudeDaemonPool(self, size, work_dir, add_dir)
+
     def check_available(self) -> bool:
         """Check if Claude CLI is available.
 
@@ -444,6 +589,219 @@ class ClaudeCLIWrapper:
             return False
 
 
+class ClaudeDaemon:
+    """A long-lived Claude Code process that accepts prompts over stdin.
+
+    Uses the CLI's stream-json input/output mode: each prompt is written as
+    one JSON user message per line, and the process answers with a stream
+    of JSON events ending in a ``result`` event. This avoids paying process
+    startup for every task. Prompts sent to the same daemon share one
+    conversation, and the working directory is fixed for its lifetime.
+    """
+
+    def __init__(self, wrapper: ClaudeCLIWrapper, work_dir: Optional[str], add_dir: Optional[str]):
+        """Initialize the daemon.
+
+        Args:
+            wrapper: Wrapper providing CLI path, timeout and result validation
+            work_dir: Working directory for the process
+            add_dir: Directory to add with --add-dir flag
+        """
+        self.wrapper = wrapper
+        self.work_dir = work_dir
+        self.add_dir = add_dir
+        self._process: Optional[subprocess.Popen] = None
+        self._events: "queue.Queue[Optional[bytes]]" = queue.Queue()
+
+    @property
+    def alive(self) -> bool:
+        """Whether the underlying process is running."""
+        return self._process is not None and self._process.poll() is None
+
+    def start(self) -> None:
+        """Start the Claude Code process."""
+        cmd = [self.wrapper.claude_path]
+        if self.wrapper.model:
+            cmd.extend(["--model", self.wrapper.model])
+        if self.add_dir:
+            cmd.extend(["--add-dir", self.add_dir])
+        cmd.extend([
+            "--permission-mode", "acceptEdits",
+            "-p",
+            "--input-format", "stream-json",
+            "--output-format", "stream-json",
+            "--verbose"
+        ])
+
+        self._process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=self.work_dir,
+            env=self.wrapper.env
+        )
+
+        # Reader thread so send() can wait with a timeout
+        def read_events():
+            for line in self._process.stdout:
+                self._events.put(line)
+            self._events.put(None)
+
+        threading.Thread(target=read_events, daemon=True).start()
+        logger.info(f"Started persistent Claude CLI process (pid {self._process.pid})")
+
+    def send(self, prompt: str, timeout: Optional[int] = None) -> ClaudeCLIResult:
+        """Send one prompt and wait for its result.
+
+        Args:
+            prompt: Prompt to send to Claude Code
+            timeout: Override default timeout
+
+        Returns:
+            ClaudeCLIResult with execution details
+        """
+        actual_timeout = timeout or self.wrapper.timeout
+        message = {"type": "user", "message": {"role": "user", "content": prompt}}
+
+        try:
+            self._process.stdin.write(orjson.dumps(message) + b"\n")
+            self._process.stdin.flush()
+        except (AttributeError, OSError) as e:
+            return ClaudeCLIResult(success=False, output="", error=f"Claude CLI process unavailable: {e}")
+
+        deadline = time.time() + actual_timeout
+        while True:
+            try:
+                line = self._events.get(timeout=max(0.0, deadline - time.time()))
+            except queue.Empty:
+                logger.warning(f"Timeout after {actual_timeout}s, stopping persistent Claude CLI process")
+                self.close()
+                return ClaudeCLIResult(success=False, output="", error=f"Timeout after {actual_timeout} seconds")
+
+            if line is None:
+                exit_code = self._process.wait()
+                return ClaudeCLIResult(
+                    success=False,
+                    output="",
+                    error=f"Claude CLI process exited (exit code {exit_code})",
+                    exit_code=exit_code
+                )
+
+            try:
+                event = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                continue
+
+            if event.get("type") != "result":
+                continue
+
+            output = event.get("result") or ""
+            if event.get("is_error") or event.get("subtype") != "success":
+                return self.wrapper._process_result(output, output or str(event.get("subtype")), 1)
+            return self.wrapper._process_result(output, "", 0)
+
+    def close(self) -> None:
+        """Stop the Claude Code process."""
+        if self._process is None:
+            return
+        try:
+            if self._process.stdin:
+                self._process.stdin.close()
+            self._process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self._process.kill()
+            self._process.wait()
+        logger.info("Stopped persistent Claude CLI process")
+
+
+class ClaudeDaemonPool:
+    """A fixed number of persistent Claude Code processes for one directory.
+
+    Each concurrent prompt takes an idle process, starting (or restarting)
+    it on demand. If a process cannot be started or dies mid-prompt, the
+    prompt is run in a one-off process instead.
+    """
+
+    def __init__(
+        self,
+        wrapper: ClaudeCLIWrapper,
+        size: int,
+        work_dir: Optional[str],
+        add_dir: Optional[str]
+    ):
+        """Initialize the pool.
+
+        Args:
+            wrapper: Wrapper used to start processes and for fallbacks
+            size: Maximum number of processes
+            work_dir: Working directory for the processes
+            add_dir: Directory to add with --add-dir flag
+        """
+        self.wrapper = wrapper
+        self.size = max(1, size)
+        self.work_dir = work_dir
+        self.add_dir = add_dir
+        # One slot per process; None means not started yet
+        self._idle: "queue.Queue[Optional[ClaudeDaemon]]" = queue.Queue()
+        for _ in range(self.size):
+            self._idle.put(None)
+
+    def matches(self, work_dir: Optional[str], add_dir: Optional[str]) -> bool:
+        """Check whether the pool serves the given directories.
+
+        Args:
+            work_dir: Working directory
+            add_dir: Directory added with --add-dir
+
+        Returns:
+            True if prompts for these directories can use this pool
+        """
+        return self.work_dir == work_dir and self.add_dir == add_dir
+
+    def send(self, prompt: str, timeout: Optional[int] = None) -> ClaudeCLIResult:
+        """Send a prompt to an idle process, blocking until one is free.
+
+        Args:
+            prompt: Prompt to send to Claude Code
+            timeout: Override default timeout
+
+        Returns:
+            ClaudeCLIResult with execution details
+        """
+        daemon = self._idle.get()
+        result = None
+        try:
+            if daemon is None or not daemon.alive:
+                daemon = self.wrapper.open_daemon(self.work_dir, self.add_dir)
+            result = daemon.send(prompt, timeout)
+        except OSError as e:
+            logger.warning(f"Could not start persistent Claude CLI process: {e}")
+        finally:
+            self._idle.put(daemon)
+
+        if result is None or (not result.success and not daemon.alive):
+            logger.warning("Persistent Claude CLI process unavailable, running task in a new process")
+            return self.wrapper.run(prompt, self.work_dir, timeout, add_dir=self.add_dir)
+        return result
+
+    def close(self) -> None:
+        """Stop all idle processes.
+
+        Safe to call more than once; a later prompt starts a new process.
+        """
+        daemons = []
+        while True:
+            try:
+                daemons.append(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        for daemon in daemons:
+            if daemon is not None:
+                daemon.close()
+            self._idle.put(None)
+
+
 # Global wrapper instance
 _wrapper: Optional[ClaudeCLIWrapper] = None
 
@@ -481,6 +839,27 @@ def run_claude_cli(
     return wrapper.run(prompt, work_dir, timeout, add_dir=add_dir)
 
 
+async def run_claude_cli_async(
+    prompt: str,
+    work_dir: Optional[str] = None,
+    timeout: Optional[int] = None,
+    add_dir: Optional[str | List[str]] = None
+) -> ClaudeCLIResult:
+    """Convenience function to run Claude CLI from a coroutine.
+
+    Args:
+        prompt: Prompt to send to Claude Code
+        work_dir: Working directory for execution
+        timeout: Override default timeout
+        add_dir: Directory path(s) to add with --add-dir flag (string or list of strings)
+
+    Returns:
+        ClaudeCLIResult with execution details
+    """
+    wrapper = get_claude_cli()
+    return await wrapper.run_async(prompt, work_dir, timeout, add_dir=add_dir)
+
+
 def create_non_interactive_prompt(
     task_description: str,
     context: str = "",
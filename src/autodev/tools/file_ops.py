@@ -1,17 +1,42 @@
 """File operations for the multi-agent system."""
 
-import json
+import fnmatch
+import hashlib
+import os
 import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import orjson
 
 from ..utils.logger import get_logger
 from ..utils.helpers import ensure_directory
 from ..config.settings import get_settings
+from ..core.task_table import TaskScheduler, TaskTable
 
 
 logger = get_logger()
 
+# Background writer for artifacts that are not read back right away
+_write_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="artifact-writer")
+_pending_writes: List[Tuple[Future, str | Path]] = []
+_pending_lock = threading.Lock()
+
+# Digest of the last content update_tasks_json_file() wrote, per tasks.json path
+_tasks_digests: Dict[str, bytes] = {}
+_tasks_digest_lock = threading.Lock()
+
+# Markdown parsing patterns
+_HEADING_RE = re.compile(r"^#{2,3}\s+(.+)")
+# Info string after an opening ``` fence (language name, then newline)
+_FENCE_HEADER_RE = re.compile(r"\w*\n")
+
+# Documents at least this long are parsed without caching the result
+_SECTION_CACHE_MAX_LENGTH = 1_000_000
+
 
 def read_file(file_path: str | Path, encoding: str = "utf-8") -> str:
     """Read a file and return its content.
@@ -32,7 +57,11 @@ def read_file(file_path: str | Path, encoding: str = "utf-8") -> str:
         raise FileNotFoundError(f"File not found: {file_path}")
 
     try:
-        content = path.read_text(encoding=encoding)
+        # Decode the raw bytes directly instead of going through a TextIOWrapper
+        content = path.read_bytes().decode(encoding)
+        if "\r" in content:
+            # Keep read_text()'s universal newline translation
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
         logger.debug(f"Read file: {file_path} ({len(content)} bytes)")
         return content
     except Exception as e:
@@ -55,13 +84,35 @@ def write_file(file_path: str | Path, content: str, encoding: str = "utf-8") ->
     ensure_directory(path.parent)
 
     try:
-        path.write_text(content, encoding=encoding)
+        path.write_bytes(content.encode(encoding))
         logger.debug(f"Wrote file: {file_path} ({len(content)} bytes)")
     except Exception as e:
         logger.error(f"Failed to write file {file_path}: {e}")
         raise
 
 
+def write_files(directory: str | Path, files: Dict[str, str], encoding: str = "utf-8") -> None:
+    """Write several files into one directory, creating it once.
+
+    Args:
+        directory: Target directory
+        files: Mapping of file name to content
+        encoding: File encoding (default: utf-8)
+
+    Raises:
+        IOError: If a file cannot be written
+    """
+    directory = ensure_directory(directory)
+    for name, content in files.items():
+        path = directory / name
+        try:
+            path.write_bytes(content.encode(encoding))
+            logger.debug(f"Wrote file: {path} ({len(content)} bytes)")
+        except Exception as e:
+            logger.error(f"Failed to write file {path}: {e}")
+            raise
+
+
 def append_file(file_path: str | Path, content: str, encoding: str = "utf-8") -> None:
     """Append content to a file.
 
@@ -108,19 +159,55 @@ def list_files(directory: str | Path, pattern: str = "*", recursive: bool = Fals
         return []
 
     if recursive:
-        return list(dir_path.rglob(pattern))
+        if "/" in pattern or "**" in pattern:
+            return list(dir_path.rglob(pattern))
+        # Single-component pattern: match names per directory from os.walk's
+        # scandir results instead of building a Path for every entry. Like
+        # rglob, directories are matched too and symlinked ones are not entered.
+        matches: List[Path] = []
+        for root, dirnames, filenames in os.walk(dir_path):
+            root_path = Path(root)
+            matches.extend(root_path / name for name in fnmatch.filter(dirnames, pattern))
+            matches.extend(root_path / name for name in fnmatch.filter(filenames, pattern))
+        return matches
+    if pattern == "*":
+        # Same entries as glob("*"), without matching every name against the pattern
+        return list(dir_path.iterdir())
     return list(dir_path.glob(pattern))
 
 
 def parse_markdown_sections(markdown: str) -> Dict[str, str]:
     """Parse markdown content into sections.
 
+    Results for documents under ``_SECTION_CACHE_MAX_LENGTH`` characters are
+    cached, so extracting several sections from one PRD parses it once.
+
     Args:
         markdown: Markdown content
 
     Returns:
         Dictionary mapping section titles to content
     """
+    if len(markdown) < _SECTION_CACHE_MAX_LENGTH:
+        return dict(_parse_markdown_sections_cached(markdown))
+    return dict(_parse_markdown_sections(markdown))
+
+
+@lru_cache(maxsize=64)
+def _parse_markdown_sections_cached(markdown: str) -> Tuple[Tuple[str, str], ...]:
+    """Cached variant of :func:`_parse_markdown_sections`."""
+    return _parse_markdown_sections(markdown)
+
+
+def _parse_markdown_sections(markdown: str) -> Tuple[Tuple[str, str], ...]:
+    """Split markdown into (section, content) pairs.
+
+    Args:
+        markdown: Markdown content
+
+    Returns:
+        Immutable (section title, content) pairs; a repeated title keeps its last content
+    """
     sections: Dict[str, str] = {}
     current_section = "introduction"
     current_content: List[str] = []
@@ -128,7 +215,7 @@ def parse_markdown_sections(markdown: str) -> Dict[str, str]:
     lines = markdown.split("\n")
     for line in lines:
         # Check for heading (## or ###)
-        heading_match = re.match(r"^#{2,3}\s+(.+)", line)
+        heading_match = _HEADING_RE.match(line)
         if heading_match:
             # Save previous section
             if current_content:
@@ -144,7 +231,7 @@ def parse_markdown_sections(markdown: str) -> Dict[str, str]:
     if current_content:
         sections[current_section] = "\n".join(current_content).strip()
 
-    return sections
+    return tuple(sections.items())
 
 
 def extract_markdown_section(markdown: str, section_title: str) -> Optional[str]:
@@ -173,10 +260,15 @@ def parse_tasks_json(file_path: str | Path) -> List[Dict[str, Any]]:
 
     Raises:
         FileNotFoundError: If file doesn't exist
-        json.JSONDecodeError: If file is not valid JSON
+        orjson.JSONDecodeError: If file is not valid JSON
     """
-    content = read_file(file_path)
-    tasks = json.loads(content)
+    try:
+        data = Path(file_path).read_bytes()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found: {file_path}") from None
+
+    # orjson parses the UTF-8 bytes directly, skipping the str decode
+    tasks = orjson.loads(data)
 
     if not isinstance(tasks, list):
         raise ValueError("tasks.json must contain a list of tasks")
@@ -201,6 +293,19 @@ def write_tasks_json(file_path: str | Path, tasks: List[Dict[str, Any]]) -> None
         file_path: Path to tasks.json
         tasks: List of task dictionaries
     """
+    _replace_tasks_file(Path(file_path), _dump_tasks(tasks))
+    logger.info(f"Wrote {len(tasks)} tasks to {file_path}")
+
+
+def _dump_tasks(tasks: List[Dict[str, Any]]) -> bytes:
+    """Validate a task list and serialize it as indented JSON.
+
+    Args:
+        tasks: List of task dictionaries
+
+    Returns:
+        UTF-8 encoded JSON
+    """
     # Validate tasks before writing
     for task in tasks:
         if not isinstance(task, dict):
@@ -208,9 +313,47 @@ def write_tasks_json(file_path: str | Path, tasks: List[Dict[str, Any]]) -> None
         if "id" not in task or "title" not in task:
             raise ValueError("Each task must have 'id' and 'title' fields")
 
-    content = json.dumps(tasks, indent=2)
-    write_file(file_path, content)
-    logger.info(f"Wrote {len(tasks)} tasks to {file_path}")
+    # orjson serializes straight to UTF-8 bytes, skipping the str encode step
+    return orjson.dumps(tasks, option=orjson.OPT_INDENT_2)
+
+
+def _replace_file(path: Path, content: bytes) -> None:
+    """Write a file in one call to a per-writer temp file, then swap it in.
+
+    Readers never see a half-written file.
+
+    Args:
+        path: Target file
+        content: Full file content
+    """
+    ensure_directory(path.parent)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, path)
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _replace_tasks_file(path: Path, content: bytes) -> None:
+    """Replace a tasks.json file and record the digest of what it now holds.
+
+    Every tasks.json write goes through here, so update_tasks_json_file()
+    never skips a write based on content another writer has replaced.
+
+    Args:
+        path: Target tasks.json
+        content: Full file content
+    """
+    digest = hashlib.blake2b(content, digest_size=16).digest()
+    key = str(path)
+    with _tasks_digest_lock:
+        # Forget the old digest first, so a failed write never counts as unchanged
+        _tasks_digests.pop(key, None)
+    _replace_file(path, content)
+    with _tasks_digest_lock:
+        _tasks_digests[key] = digest
 
 
 def parse_markdown_code_blocks(markdown: str, language: Optional[str] = None) -> List[Tuple[str, str]]:
@@ -223,12 +366,29 @@ def parse_markdown_code_blocks(markdown: str, language: Optional[str] = None) ->
     Returns:
         List of (language, code) tuples
     """
-    pattern = r"```(\w*)\n(.*?)```"
-    matches = re.findall(pattern, markdown, re.DOTALL)
+    # Same matches as re.findall(r"```(\w*)\n(.*?)```", markdown, re.DOTALL), but each
+    # fence is located with str.find, so an unclosed fence costs one scan instead
+    # of a lazy-quantifier walk to the end of the document from every ``` after it
+    wanted = language.lower() if language else None
+    blocks: List[Tuple[str, str]] = []
+    pos = 0
+    while True:
+        start = markdown.find("```", pos)
+        if start < 0:
+            break
+        header = _FENCE_HEADER_RE.match(markdown, start + 3)
+        if header is None:
+            pos = start + 1
+            continue
+        end = markdown.find("```", header.end())
+        if end < 0:
+            break  # no later fence can be closed either
+        lang = markdown[start + 3:header.end() - 1]
+        if wanted is None or lang.lower() == wanted:
+            blocks.append((lang, markdown[header.end():end]))
+        pos = end + 3
 
-    if language:
-        return [(lang, code) for lang, code in matches if lang.lower() == language.lower()]
-    return matches
+    return blocks
 
 
 def get_task_by_id(tasks: List[Dict[str, Any]], task_id: str) -> Optional[Dict[str, Any]]:
@@ -257,24 +417,7 @@ def get_ready_tasks(tasks: List[Dict[str, Any]], completed: List[str]) -> List[D
     Returns:
         List of tasks ready for execution
     """
-    ready = []
-    completed_set = set(completed)
-
-    for task in tasks:
-        # Skip already completed tasks
-        if task["id"] in completed_set:
-            continue
-
-        # Skip tasks with status "completed"
-        if task.get("status") == "completed":
-            continue
-
-        # Check if all dependencies are satisfied
-        dependencies = task.get("dependencies", [])
-        if all(dep in completed_set for dep in dependencies):
-            ready.append(task)
-
-    return ready
+    return TaskScheduler(TaskTable(tasks), completed).ready_tasks()
 
 
 def validate_json_structure(data: Any, schema: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
@@ -359,5 +502,65 @@ def update_tasks_json_file(session_id: str, task_list: List[Dict[str, Any]]) ->
     settings = get_settings()
     workspace = settings.get_session_workspace(session_id)
     tasks_path = workspace / "tasks.json"
-    write_tasks_json(tasks_path, task_list)
+
+    # Skip the write when the file already holds exactly this content
+    content = _dump_tasks(task_list)
+    digest = hashlib.blake2b(content, digest_size=16).digest()
+    key = str(tasks_path)
+    with _tasks_digest_lock:
+        unchanged = _tasks_digests.get(key) == digest
+    if unchanged and tasks_path.exists():
+        logger.debug(f"tasks.json for session {session_id} unchanged, skipping write")
+        return
+
+    _replace_tasks_file(tasks_path, content)
     logger.info(f"Updated tasks.json for session {session_id} with {len(task_list)} tasks")
+
+
+def submit_write(write_fn: Callable[..., None], file_path: str | Path, *args: Any) -> Future:
+    """Run a write function on the background writer without waiting for it.
+
+    Call wait_for_pending_writes() before reading the file back; it
+    returns the failures so the caller can record them.
+
+    Args:
+        write_fn: Function taking the file path first, e.g. write_file
+        file_path: Path being written
+        *args: Remaining arguments for write_fn
+
+    Returns:
+        Future for the write
+    """
+    future = _write_pool.submit(write_fn, file_path, *args)
+
+    def log_outcome(done: Future) -> None:
+        if done.exception() is not None:
+            logger.error(f"Failed to write {file_path}: {done.exception()}")
+        else:
+            logger.info(f"Saved: {file_path}")
+
+    future.add_done_callback(log_outcome)
+    with _pending_lock:
+        _pending_writes.append((future, file_path))
+    return future
+
+
+def wait_for_pending_writes() -> List[str]:
+    """Block until every write submitted via submit_write() has finished.
+
+    Each failure is reported once, to the first caller that waits on it.
+
+    Returns:
+        Error messages for the writes that failed (empty if all succeeded)
+    """
+    with _pending_lock:
+        pending = list(_pending_writes)
+        _pending_writes.clear()
+
+    errors: List[str] = []
+    for future, file_path in pending:
+        try:
+            future.result()
+        except Exception as e:
+            errors.append(f"Failed to write {file_path}: {e}")
+    return errors
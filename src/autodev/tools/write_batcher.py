@@ -0,0 +1,84 @@
+"""Write-behind batching for tasks.json updates."""
+
+import atexit
+import threading
+from typing import Any, Dict, List, Optional
+
+from .file_ops import update_tasks_json_file
+from ..utils.logger import get_logger
+
+
+logger = get_logger()
+
+
+class WriteBatcher:
+    """Coalesce tasks.json writes into at most one write per flush interval.
+
+    Each session keeps only its latest pending task list; a timer writes it
+    out once the interval elapses. Pending writes are flushed on demand and
+    at interpreter exit. Flushes run one at a time, so an older task list
+    can never be written after a newer one.
+    """
+
+    def __init__(self, flush_interval_ms: int = 50):
+        """Initialize the batcher.
+
+        Args:
+            flush_interval_ms: Delay before a pending write is flushed
+        """
+        self.flush_interval = flush_interval_ms / 1000
+        self._pending: Dict[str, List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        # Held from taking the pending lists until they are written
+        self._flush_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    def enqueue(self, session_id: str, task_list: List[Dict[str, Any]], sync: bool = False) -> None:
+        """Schedule a tasks.json write for a session.
+
+        Args:
+            session_id: Session identifier
+            task_list: Current list of tasks; replaces any pending list for the session
+            sync: Write immediately (together with any other pending sessions)
+        """
+        with self._lock:
+            self._pending[session_id] = task_list
+            if not sync and self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if sync:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all pending task lists to disk."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+
+            for session_id, task_list in pending.items():
+                try:
+                    update_tasks_json_file(session_id, task_list)
+                except Exception as e:
+                    logger.error(f"Failed to write tasks.json for session {session_id}: {e}")
+
+
+# Global batcher instance
+_batcher: Optional[WriteBatcher] = None
+
+
+def get_write_batcher() -> WriteBatcher:
+    """Get or create the global write batcher.
+
+    Returns:
+        WriteBatcher instance
+    """
+    global _batcher
+    if _batcher is None:
+        _batcher = WriteBatcher()
+        atexit.register(_batcher.flush)
+    return _batcher
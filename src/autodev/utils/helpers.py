@@ -1,11 +1,12 @@
 """Utility functions for the multi-agent system."""
 
+import asyncio
 import os
 import re
 import uuid
 from pathlib import Path
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Dict, List, Optional
 
 
 def generate_session_id() -> str:
@@ -222,3 +223,22 @@ def chunk_list(items: List[Any], chunk_size: int) -> List[List[Any]]:
         List of chunks
     """
     return [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+
+async def gather_with_concurrency(limit: int, *aws: Awaitable[Any]) -> List[Any]:
+    """Await several awaitables concurrently with at most ``limit`` in flight.
+
+    Args:
+        limit: Maximum number of awaitables running at the same time
+        *aws: Awaitables to run
+
+    Returns:
+        List of results, in the same order as the awaitables
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(aw: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(run(aw) for aw in aws))
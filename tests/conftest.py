@@ -14,6 +14,17 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 os.environ["ANTHROPIC_API_KEY"] = "test_key_for_testing"
 
 
+@pytest.fixture(autouse=True)
+def reset_llm_clients():
+    """Keep LLM clients (possibly mocks) and their cached responses from leaking between tests."""
+    from src.agents.base import reset_llm_clients, reset_response_cache
+    reset_llm_clients()
+    reset_response_cache()
+    yield
+    reset_llm_clients()
+    reset_response_cache()
+
+
 @pytest.fixture
 def mock_settings():
     """Mock settings for testing."""
@@ -3,8 +3,15 @@
 import pytest
 from unittest.mock import Mock, patch
 
-from src.agents.architect_agent import ArchitectAgent, architect_agent_node
+from src.agents.architect_agent import (
+    ArchitectAgent,
+    ArchitectOutput,
+    architect_agent_node,
+    check_task_dependencies,
+    reset_architect_agent,
+)
 from src.core.state import create_initial_state
+from src.tools.file_ops import submit_write
 
 
 class TestArchitectAgent:
@@ -37,6 +44,20 @@ class TestArchitectAgent:
         assert "/path/to/PRD.md" in prompt
         assert "Technical Design" in prompt
 
+    def test_build_prompt_falls_back_to_state_prd(self):
+        """Test that an unreadable PRD file falls back to the PRD in state."""
+        agent = ArchitectAgent()
+        state = create_initial_state(
+            requirement="Build a todo app",
+            session_id="test_session"
+        )
+        state["prd_file_path"] = "/path/to/PRD.md"
+        state["prd_content"] = "# PRD\n\nTodo items with due dates"
+
+        prompt = agent._build_prompt(state)
+
+        assert "Todo items with due dates" in prompt
+
     def test_split_design_and_tasks(self):
         """Test splitting design and tasks from response."""
         agent = ArchitectAgent()
@@ -99,6 +120,21 @@ Tasks:
         assert len(tasks) >= 1
         assert "id" in tasks[0]
 
+    def test_extract_tasks_flexible_json_array(self):
+        """Test flexible extraction of an inline JSON task array."""
+        agent = ArchitectAgent()
+
+        response = """
+Here are the tasks: [
+  {"id": "task_001", "title": "Setup [core]", "dependencies": []},
+  {"id": "task_002", "title": "Build", "dependencies": ["task_001"]}
+] and some trailing text ]
+"""
+        tasks = agent._extract_tasks_flexible(response)
+
+        assert [t["id"] for t in tasks] == ["task_001", "task_002"]
+        assert tasks[0]["title"] == "Setup [core]"
+
     @patch('src.agents.base.ChatAnthropic')
     def test_parse_response(self, mock_llm, tmp_path):
         """Test parsing LLM response."""
@@ -199,6 +235,93 @@ End-to-end tests for user workflows.
             assert updates["current_task_index"] == 0
             assert len(updates["task_list"]) == 2
 
+    def test_save_artifacts_orders_tasks_by_dependencies(self, tmp_path):
+        """Test that tasks are stored in an order that satisfies dependencies."""
+        agent = ArchitectAgent()
+        state = create_initial_state(
+            requirement="Build a todo app",
+            session_id="test_session"
+        )
+        tasks = [
+            {"id": "task_003", "title": "API", "dependencies": ["task_002"]},
+            {"id": "task_001", "title": "Setup", "dependencies": []},
+            {"id": "task_002", "title": "Models", "dependencies": ["task_001"]},
+            {"id": "task_004", "title": "Docs", "dependencies": []},
+        ]
+
+        with patch.object(agent.settings, "get_session_workspace", return_value=tmp_path):
+            updates = agent._save_artifacts("# Design", tasks, state)
+
+        assert [t["id"] for t in updates["task_list"]] == ["task_001", "task_002", "task_003", "task_004"]
+        assert updates["task_cycle"] == []
+        assert "error" not in updates
+
+    def test_save_artifacts_records_cycle_for_routing(self, tmp_path):
+        """Test that a dependency cycle is found once and routed on from state."""
+        agent = ArchitectAgent()
+        state = create_initial_state(
+            requirement="Build a todo app",
+            session_id="test_session"
+        )
+        tasks = [
+            {"id": "task_001", "title": "Setup", "dependencies": ["task_002"]},
+            {"id": "task_002", "title": "Models", "dependencies": ["task_001"]},
+        ]
+
+        with patch.object(agent.settings, "get_session_workspace", return_value=tmp_path):
+            updates = agent._save_artifacts("# Design", tasks, state)
+
+        assert updates["task_cycle"] == ["task_001", "task_002", "task_001"]
+        assert "Circular task dependencies" in updates["error"]
+        state.update(updates)
+        with patch('src.agents.architect_agent.detect_task_cycles') as mock_detect:
+            assert check_task_dependencies(state) == "has_cycle"
+        mock_detect.assert_not_called()
+
+    def test_save_artifacts_keeps_design_when_task_lacks_id(self, tmp_path):
+        """Test that a task without an id does not lose the design."""
+        agent = ArchitectAgent()
+        state = create_initial_state(
+            requirement="Build a todo app",
+            session_id="test_session"
+        )
+        tasks = [
+            {"id": "task_002", "title": "Models", "dependencies": ["task_001"]},
+            {"title": "Setup"},
+        ]
+
+        with patch.object(agent.settings, "get_session_workspace", return_value=tmp_path):
+            updates = agent._save_artifacts("# Design", tasks, state)
+
+        assert updates["design_content"] == "# Design"
+        assert updates["task_list"] == tasks
+        assert (tmp_path / "Design.md").read_text() == "# Design"
+        assert not (tmp_path / "tasks.json").exists()
+
+    @patch('src.agents.base.ChatAnthropic')
+    def test_execute_structured_output(self, mock_llm, monkeypatch):
+        """Test that structured output bypasses free-form parsing."""
+        from src.config.settings import get_settings
+        monkeypatch.setattr(get_settings().agent, "architect_structured_output", True)
+
+        agent = ArchitectAgent()
+        agent.llm.with_structured_output.return_value.invoke.return_value = ArchitectOutput(
+            design="# Design\n\n## Architecture Overview",
+            tasks=[{"id": "task_001", "title": "Setup", "description": "Create project"}]
+        )
+        state = create_initial_state(
+            requirement="Build a simple calculator",
+            session_id="test_structured"
+        )
+
+        with patch.object(agent, "_parse_response") as mock_parse:
+            updates = agent.execute(state)
+
+        mock_parse.assert_not_called()
+        assert updates["design_content"].startswith("# Design")
+        assert updates["task_list"][0]["status"] == "pending"
+        assert updates["task_list"][0]["dependencies"] == []
+
     def test_architect_agent_node(self):
         """Test Architect agent node function."""
         state = create_initial_state(
@@ -207,6 +330,7 @@ End-to-end tests for user workflows.
         )
         state["prd_file_path"] = "/path/to/PRD.md"
 
+        reset_architect_agent()
         with patch('src.agents.architect_agent.ArchitectAgent') as mock_agent_class:
             mock_agent = Mock()
             mock_agent.execute.return_value = {
@@ -221,3 +345,45 @@ End-to-end tests for user workflows.
             mock_agent.execute.assert_called_once()
             assert "design_content" in result
             assert "task_list" in result
+
+    def test_architect_agent_node_reports_failed_prd_write(self, tmp_path):
+        """Test that a PRD write that failed in the background reaches state."""
+        def failing_write(file_path, content):
+            raise OSError("disk full")
+
+        state = create_initial_state(
+            requirement="Build a simple calculator",
+            session_id="test_node"
+        )
+        submit_write(failing_write, tmp_path / "PRD.md", "# PRD")
+
+        reset_architect_agent()
+        with patch('src.agents.architect_agent.ArchitectAgent') as mock_agent_class:
+            mock_agent_class.return_value.execute.return_value = {"design_content": "# Design"}
+
+            result = architect_agent_node(state)
+
+        assert result["design_content"] == "# Design"
+        assert "PRD.md" in result["error"]
+        assert "disk full" in result["error"]
+
+    def test_save_artifacts_reports_failed_design_write(self, tmp_path):
+        """Test that a failed Design.md write is reported and stops coding."""
+        agent = ArchitectAgent()
+        state = create_initial_state(
+            requirement="Build a simple calculator",
+            session_id="test_node"
+        )
+
+        with patch.object(agent.settings, "get_session_workspace", return_value=tmp_path), \
+                patch('src.agents.architect_agent.write_file', side_effect=OSError("disk full")):
+            updates = agent._save_artifacts("# Design", [], state)
+
+        assert updates["design_content"] == "# Design"
+        assert "Design.md" in updates["error"]
+        assert "disk full" in updates["error"]
+        state.update(updates)
+        assert check_task_dependencies(state) == "write_failed"
+
+        (tmp_path / "Design.md").write_text("# Design")
+        assert check_task_dependencies(state) == "valid"
@@ -0,0 +1,219 @@
+"""Unit tests for Coder Agent."""
+
+import time
+from unittest.mock import Mock, patch
+
+from src.agents.coder_agent import CoderAgent, get_coder_agent, reset_coder_agent
+from src.core.state import create_initial_state, merge_completed_tasks, merge_task_list
+
+
+class TestCoderAgent:
+    """Test Coder Agent functionality."""
+
+    @patch('src.tools.write_batcher.update_tasks_json_file')
+    @patch('src.agents.base.ChatAnthropic')
+    def test_execute_all_tasks_runs_dependency_waves(self, mock_llm, mock_update, tmp_path):
+        """Test that batch execution follows dependencies and merges results."""
+        agent = CoderAgent()
+        agent.max_parallel_tasks = 2
+        state = create_initial_state(
+            requirement="Build a todo app",
+            session_id="test_session"
+        )
+        state["project_dir"] = str(tmp_path)
+        state["task_list"] = [
+            {"id": "task_001", "title": "Models", "dependencies": [], "status": "pending"},
+            {"id": "task_002", "title": "Storage", "dependencies": [], "status": "pending"},
+            {"id": "task_003", "title": "API", "dependencies": ["task_001", "task_002"], "status": "pending"},
+        ]
+
+        executed = []
+
+        async def fake_run_task(task, work_dir, add_dir, design_path):
+            executed.append(task["id"])
+            return Mock(success=True, output="done", error=None), time.time(), 0.1
+
+        with patch.object(agent, "_run_task_async", side_effect=fake_run_task):
+            updates = agent.execute_all_tasks(state)
+
+        assert executed[-1] == "task_003"
+        assert set(executed[:2]) == {"task_001", "task_002"}
+        assert updates["completed_tasks"] == executed
+        assert updates["current_task_index"] == 3
+        assert updates["coding_output"] == "Completed all 3 tasks"
+        assert all(t["status"] == "completed" for t in updates["task_list"])
+        mock_update.assert_called_with("test_session", updates["task_list"])
+
+    @patch('src.tools.write_batcher.update_tasks_json_file')
+    @patch('src.agents.base.ChatAnthropic')
+    def test_execute_all_tasks_retries_failures_and_stops_when_stuck(self, mock_llm, mock_update, tmp_path):
+        """Test that failed tasks are retried and unsatisfiable tasks are not run."""
+        agent = CoderAgent()
+        state = create_initial_state(
+            requirement="Build a todo app",
+            session_id="test_session"
+        )
+        state["project_dir"] = str(tmp_path)
+        state["task_list"] = [
+            {"id": "task_001", "title": "Models", "dependencies": [], "status": "pending"},
+            {"id": "task_002", "title": "API", "dependencies": ["task_001"], "status": "pending"},
+            {"id": "task_003", "title": "Orphan", "dependencies": ["task_999"], "status": "pending"},
+        ]
+
+        executed = []
+
+        async def fake_run_task(task, work_dir, add_dir, design_path):
+            executed.append(task["id"])
+            success = executed.count("task_001") > 1 or task["id"] != "task_001"
+            return Mock(success=success, output="done", error="boom"), time.time(), 0.1
+
+        with patch.object(agent, "_run_task_async", side_effect=fake_run_task):
+            updates = agent.execute_all_tasks(state)
+
+        assert executed == ["task_001", "task_001", "task_002"]
+        assert updates["completed_tasks"] == ["task_001", "task_002"]
+        assert updates["current_task_index"] == 2
+        assert updates["coding_iterations"] == 3
+        assert "unsatisfiable dependencies" in updates["coding_output"]
+
+    @patch('src.tools.write_batcher.update_tasks_json_file')
+    @patch('src.agents.base.ChatAnthropic')
+    def test_execute_all_tasks_treats_exceptions_as_failures(self, mock_llm, mock_update, tmp_path):
+        """Test that a task raising is retried without cancelling the other tasks."""
+        agent = CoderAgent()
+        agent.max_parallel_tasks = 2
+        state = create_initial_state(
+            requirement="Build a todo app",
+            session_id="test_session"
+        )
+        state["project_dir"] = str(tmp_path)
+        state["task_list"] = [
+            {"id": "task_001", "title": "Models", "dependencies": [], "status": "pending"},
+            {"id": "task_002", "title": "Storage", "dependencies": [], "status": "pending"},
+        ]
+
+        executed = []
+
+        async def fake_run_task(task, work_dir, add_dir, design_path):
+            executed.append(task["id"])
+            if executed == ["task_001"]:
+                raise RuntimeError("daemon died")
+            return Mock(success=True, output="done", error=None), time.time(), 0.1
+
+        with patch.object(agent, "_run_task_async", side_effect=fake_run_task):
+            updates = agent.execute_all_tasks(state)
+
+        assert executed == ["task_001", "task_002", "task_001"]
+        assert updates["completed_tasks"] == ["task_002", "task_001"]
+        assert updates["coding_output"] == "Completed all 2 tasks"
+        mock_update.assert_called_with("test_session", updates["task_list"])
+
+    @patch('src.tools.write_batcher.update_tasks_json_file')
+    @patch('src.agents.base.ChatAnthropic')
+    def test_execute_single_task_returns_task_patch(self, mock_llm, mock_update, tmp_path):
+        """Test that a single task returns a patch the task_list reducer can apply."""
+        agent = CoderAgent()
+        state = create_initial_state(
+            requirement="Build a todo app",
+            session_id="test_session"
+        )
+        state["project_dir"] = str(tmp_path)
+        tasks = [
+            {"id": "task_001", "title": "Models", "dependencies": [], "status": "pending"},
+            {"id": "task_002", "title": "Storage", "dependencies": [], "status": "pending"},
+        ]
+        state["task_list"] = [dict(t) for t in tasks]
+
+        result = Mock(success=True, output="done", error=None)
+        with patch.object(agent, "_run_task", return_value=(result, time.time(), 0.1)):
+            updates = agent._execute_single_task(state, state["task_list"][0])
+
+        assert list(updates["task_list"]) == ["task_001"]
+        assert state["task_list"][0]["status"] == "pending"
+        merged = merge_task_list(tasks, updates["task_list"])
+        assert merged[0]["status"] == "completed"
+        assert merged[1] is tasks[1]
+        assert merge_task_list(tasks, merged) is merged
+        assert updates["completed_tasks"] == ["task_001"]
+        assert merge_completed_tasks(["task_002"], updates["completed_tasks"]) == ["task_002", "task_001"]
+        assert merge_completed_tasks(["task_001"], updates["completed_tasks"]) == ["task_001"]
+
+    @patch('src.agents.base.ChatAnthropic')
+    def test_read_design_caches_until_file_changes(self, mock_llm, tmp_path):
+        """Test that the design is read once and re-read only after a change."""
+        agent = CoderAgent()
+        design = tmp_path / "Design.md"
+        design.write_text("# Design v1")
+
+        with patch('src.agents.coder_agent.read_file', side_effect=lambda p: design.read_text()) as mock_read:
+            assert agent._read_design(str(design)) == "# Design v1"
+            assert agent._read_design(str(design)) == "# Design v1"
+            assert mock_read.call_count == 1
+
+            design.write_text("# Design v2 with more content")
+            assert agent._read_design(str(design)) == "# Design v2 with more content"
+            assert mock_read.call_count == 2
+
+    @patch('src.agents.base.ChatAnthropic')
+    def test_get_coder_agent_reuses_instance_without_llm(self, mock_llm):
+        """Test that the node agent is shared and never builds an LLM client."""
+        reset_coder_agent()
+        try:
+            agent = get_coder_agent()
+            assert get_coder_agent() is agent
+            mock_llm.assert_not_called()
+        finally:
+            reset_coder_agent()
+
+    @patch('src.agents.base.ChatAnthropic')
+    def test_build_task_prompt_matches_prompt_builder(self, mock_llm):
+        """Test that the precomputed prompt template matches create_non_interactive_prompt."""
+        from src.agents.coder_agent import _TASK_CONSTRAINTS
+        from src.tools.claude_cli import create_non_interactive_prompt
+
+        agent = CoderAgent()
+        task = {"id": "task_001", "title": "Models {x}", "description": "Add {models}"}
+        prompt = agent._build_task_prompt(task, "/tmp/work", "")
+
+        assert prompt == create_non_interactive_prompt(
+            task_description=f"""
+Task ID: task_001
+Title: Models {{x}}
+Description: Add {{models}}
+
+Implement this task according to the technical design above.
+""",
+            context="Working in directory: /tmp/work",
+            constraints=_TASK_CONSTRAINTS
+        )
+
+    @patch('src.tools.write_batcher.update_tasks_json_file')
+    @patch('src.agents.base.ChatAnthropic')
+    def test_persistent_session_keeps_pool_across_tasks(self, mock_llm, mock_update, tmp_path, monkeypatch):
+        """Test that single-task ticks reuse one persistent Claude CLI pool."""
+        monkeypatch.setattr(CoderAgent().settings.claude_cli, "persistent_session", True)
+        agent = CoderAgent()
+        state = create_initial_state(
+            requirement="Build a todo app",
+            session_id="test_session"
+        )
+        state["project_dir"] = str(tmp_path)
+        state["task_list"] = [
+            {"id": "task_001", "title": "Models", "dependencies": [], "status": "pending"},
+            {"id": "task_002", "title": "Storage", "dependencies": [], "status": "pending"},
+        ]
+
+        pool = Mock()
+        pool.matches.return_value = True
+        pool.size = 1
+        pool.send.return_value = Mock(success=True, output="done", error=None)
+
+        with patch('src.agents.coder_agent.get_claude_cli') as mock_cli:
+            mock_cli.return_value.open_daemon_pool.return_value = pool
+            agent._execute_single_task(state, state["task_list"][0])
+            agent._execute_single_task(state, state["task_list"][1])
+            agent._close_daemon_pool()
+
+        mock_cli.return_value.open_daemon_pool.assert_called_once()
+        assert pool.send.call_count == 2
+        pool.close.assert_called_once()
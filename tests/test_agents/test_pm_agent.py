@@ -1,10 +1,11 @@
 """Unit tests for PM Agent."""
 
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
-from src.agents.pm_agent import PMAgent, pm_agent_node
+from src.agents.pm_agent import PMAgent, pm_agent_node, reset_pm_agent
 from src.core.state import create_initial_state
+from src.tools.file_ops import wait_for_pending_writes, write_files
 
 
 class TestPMAgent:
@@ -16,6 +17,15 @@ class TestPMAgent:
         assert agent.name == "PM_Agent"
         assert agent.system_prompt is not None
 
+    @patch('src.agents.base.ChatAnthropic')
+    def test_llm_client_shared_between_instances(self, mock_llm):
+        """Test that agents with the same model config share one LLM client."""
+        first = PMAgent()
+        second = PMAgent()
+
+        assert first.llm is second.llm
+        mock_llm.assert_called_once()
+
     def test_get_default_system_prompt(self):
         """Test getting default system prompt."""
         agent = PMAgent()
@@ -98,6 +108,28 @@ As a user, I want to manage todos.
             assert updates["prd_iteration"] == 1
             assert "Overview" in updates["prd_content"]
 
+    @patch('src.agents.base.ChatAnthropic')
+    def test_parse_response_skips_unchanged_prd(self, mock_llm, tmp_path):
+        """Test that an unchanged PRD revision is not validated or written again."""
+        agent = PMAgent()
+        state = create_initial_state(
+            requirement="Build a todo app",
+            session_id="test_session"
+        )
+        response = "# Product Requirements Document\n\n## Overview\nSame PRD."
+
+        with patch.object(agent.settings, "get_session_workspace", return_value=tmp_path), \
+                patch('src.agents.pm_agent.write_files', side_effect=write_files) as mock_write, \
+                patch('src.agents.pm_agent.validate_prd', return_value=(True, [])) as mock_validate:
+            state.update(agent._parse_response(response, state))
+            wait_for_pending_writes()
+            state.update(agent._parse_response(response, state))
+            wait_for_pending_writes()
+
+        mock_write.assert_called_once()
+        mock_validate.assert_called_once()
+        assert state["prd_iteration"] == 2
+
     def test_pm_agent_node(self):
         """Test PM agent node function."""
         state = create_initial_state(
@@ -105,6 +137,7 @@ As a user, I want to manage todos.
             session_id="test_node"
         )
 
+        reset_pm_agent()
         with patch('src.agents.pm_agent.PMAgent') as mock_agent_class:
             mock_agent = Mock()
             mock_agent.execute.return_value = {
@@ -117,3 +150,52 @@ As a user, I want to manage todos.
 
             mock_agent.execute.assert_called_once()
             assert "prd_content" in result
+
+    @patch('src.agents.base.ChatAnthropic')
+    def test_execute_batch(self, mock_llm):
+        """Test generating several PRDs with one batched LLM call."""
+        agent = PMAgent()
+        agent.llm.abatch = AsyncMock(return_value=[Mock(content="# PRD A"), RuntimeError("overloaded")])
+        states = [
+            create_initial_state(requirement="Build a todo app", session_id="test_batch_a"),
+            create_initial_state(requirement="Build a notes app", session_id="test_batch_b"),
+        ]
+
+        with patch.object(agent, "_parse_response", return_value={"prd_content": "# PRD A"}) as mock_parse:
+            results = agent.execute_batch(states)
+
+        agent.llm.abatch.assert_awaited_once()
+        assert len(agent.llm.abatch.await_args.args[0]) == 2
+        mock_parse.assert_called_once_with("# PRD A", states[0])
+        assert results[0] == {"prd_content": "# PRD A"}
+        assert "overloaded" in results[1]["error"]
+
+    @patch('src.agents.base.ChatAnthropic')
+    def test_system_prompt_marked_for_prompt_caching(self, mock_llm):
+        """Test that the static system prompt is sent as a cache breakpoint."""
+        agent = PMAgent()
+
+        messages = agent._build_messages("Build a todo app")
+        assert messages[0].content[0]["cache_control"] == {"type": "ephemeral"}
+        assert messages[0].content[0]["text"] == agent.system_prompt
+
+        with patch.object(agent.settings.agent, "prompt_caching", False):
+            assert agent._build_messages("Build a todo app")[0].content == agent.system_prompt
+
+    @patch('src.agents.base.ChatAnthropic')
+    def test_identical_prompt_reuses_cached_response(self, mock_llm):
+        """Test that an identical LLM request is answered from the opt-in response cache."""
+        mock_llm.return_value.invoke.return_value = Mock(content="# PRD")
+        agent = PMAgent()
+
+        # The cache is off by default, so retries get a fresh response
+        agent.invoke_llm("Build a todo app")
+        agent.invoke_llm("Build a todo app")
+        assert mock_llm.return_value.invoke.call_count == 2
+
+        with patch.object(agent.settings.agent, "llm_response_cache_size", 256):
+            assert agent.invoke_llm("Build a todo app") == "# PRD"
+            assert agent.invoke_llm("Build a todo app") == "# PRD"
+            assert agent.invoke_llm("Build a notes app") == "# PRD"
+
+        assert mock_llm.return_value.invoke.call_count == 4
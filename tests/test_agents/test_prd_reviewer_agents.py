@@ -0,0 +1,69 @@
+"""Unit tests for PRD reviewer agents."""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+from src.agents.prd_reviewer_agents import (
+    PRDReviewerAgent,
+    get_reviewer_agent,
+    prd_reviewers_node,
+    reset_reviewer_agents,
+)
+from src.core.state import create_initial_state, merge_prd_reviews
+
+
+class TestPRDReviewerAgents:
+    """Test PRD reviewer agent functionality."""
+
+    def test_get_reviewer_agent_reuses_instance(self):
+        """Test that each reviewer role keeps one shared agent."""
+        reset_reviewer_agents()
+        try:
+            agent = get_reviewer_agent("pm")
+            assert isinstance(agent, PRDReviewerAgent)
+            assert agent.role == "pm"
+            assert get_reviewer_agent("pm") is agent
+            assert get_reviewer_agent("qa") is not agent
+        finally:
+            reset_reviewer_agents()
+
+    @patch('src.agents.base.ChatAnthropic')
+    def test_reviewers_share_pm_llm_client(self, mock_llm):
+        """Test that the PM agent and every reviewer use one pooled LLM client."""
+        from src.agents.pm_agent import PMAgent
+
+        pm_llm = PMAgent().llm
+        for role in ("pm", "dev", "qa"):
+            assert PRDReviewerAgent(role, "Review the PRD.").llm is pm_llm
+        mock_llm.assert_called_once()
+
+    @patch('src.agents.base.ChatAnthropic')
+    def test_parse_response_returns_only_own_review(self, mock_llm):
+        """Test that a reviewer returns its own entry for the prd_reviews reducer."""
+        agent = PRDReviewerAgent("pm", "Review the PRD.")
+        state = create_initial_state(requirement="Build a todo app", session_id="test_review")
+        state["prd_reviews"] = {"dev": "Feasible"}
+
+        updates = agent._parse_response("Looks good", state)
+
+        assert updates["prd_reviews"] == {"pm": "Looks good"}
+        assert state["prd_reviews"] == {"dev": "Feasible"}
+        assert merge_prd_reviews(state["prd_reviews"], updates["prd_reviews"]) == {
+            "dev": "Feasible", "pm": "Looks good"
+        }
+
+    @patch('src.agents.base.ChatAnthropic')
+    def test_prd_reviewers_node_merges_concurrent_reviews(self, mock_llm):
+        """Test that the fan-out node runs every reviewer and merges their reviews."""
+        mock_llm.return_value.ainvoke = AsyncMock(return_value=Mock(content="Looks good"))
+        state = create_initial_state(requirement="Build a todo app", session_id="test_review")
+        state["prd_content"] = "# PRD"
+
+        reset_reviewer_agents()
+        try:
+            result = prd_reviewers_node(state)
+        finally:
+            reset_reviewer_agents()
+
+        assert set(result["prd_reviews"]) == {"pm", "dev", "qa"}
+        assert "error" not in result
+        assert mock_llm.return_value.ainvoke.await_count == 3
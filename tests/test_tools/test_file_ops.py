@@ -4,18 +4,27 @@ import json
 import pytest
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from unittest.mock import patch
 
 from src.tools.file_ops import (
     read_file,
     write_file,
+    write_files,
     append_file,
     file_exists,
+    list_files,
     parse_markdown_sections,
+    parse_markdown_code_blocks,
     parse_tasks_json,
     write_tasks_json,
+    update_tasks_json_file,
     get_task_by_id,
     get_ready_tasks,
+    submit_write,
+    wait_for_pending_writes,
+    _replace_file,
 )
+from src.core.task_table import TaskScheduler, TaskTable
 
 
 class TestFileOperations:
@@ -33,6 +42,24 @@ class TestFileOperations:
             read_content = read_file(file_path)
             assert read_content == content
 
+    def test_read_file_translates_newlines(self):
+        """Test that Windows and old Mac line endings are read as newlines."""
+        with TemporaryDirectory() as tmpdir:
+            file_path = Path(tmpdir) / "PRD.md"
+            file_path.write_bytes("# PRD\r\n## 概述\rDone".encode("utf-8"))
+
+            assert read_file(file_path) == "# PRD\n## 概述\nDone"
+
+    def test_write_files(self):
+        """Test writing several files into a new directory."""
+        with TemporaryDirectory() as tmpdir:
+            directory = Path(tmpdir) / "session"
+
+            write_files(directory, {"PRD.md": "# PRD", "PRD_Reviews.md": "# Reviews"})
+
+            assert read_file(directory / "PRD.md") == "# PRD"
+            assert read_file(directory / "PRD_Reviews.md") == "# Reviews"
+
     def test_read_file_not_found(self):
         """Test reading a non-existent file."""
         with pytest.raises(FileNotFoundError):
@@ -60,6 +87,18 @@ class TestFileOperations:
             assert file_exists(existing_file) is True
             assert file_exists(non_existent) is False
 
+    def test_list_files(self):
+        """Test listing a directory, flat and recursively."""
+        with TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            write_file(root / "main.py", "")
+            write_file(root / "src" / "app.py", "")
+            write_file(root / "src" / "README.md", "")
+
+            assert sorted(list_files(root)) == [root / "main.py", root / "src"]
+            assert sorted(list_files(root, "*.py", recursive=True)) == [root / "main.py", root / "src" / "app.py"]
+            assert sorted(list_files(root, "src/*.md", recursive=True)) == [root / "src" / "README.md"]
+
     def test_parse_markdown_sections(self):
         """Test parsing markdown into sections."""
         markdown = """
@@ -81,6 +120,17 @@ More details here.
         assert "overview" in sections
         assert "details" in sections
 
+        # Cached parses hand out a fresh dict each time
+        sections["overview"] = "changed"
+        assert parse_markdown_sections(markdown)["overview"] == "Here is the overview."
+
+    def test_parse_markdown_code_blocks(self):
+        """Test extracting fenced code blocks, filtered by language."""
+        markdown = "Intro\n```python\nprint(1)\n```\n```\nplain\n```\n```js\nunclosed"
+
+        assert parse_markdown_code_blocks(markdown) == [("python", "print(1)\n"), ("", "plain\n")]
+        assert parse_markdown_code_blocks(markdown, "Python") == [("python", "print(1)\n")]
+
     def test_parse_tasks_json(self):
         """Test parsing tasks.json file."""
         with TemporaryDirectory() as tmpdir:
@@ -107,8 +157,40 @@ More details here.
 
             assert len(parsed_tasks) == 2
             assert parsed_tasks[0]["id"] == "task_001"
+            # The write goes through a temp file that is renamed into place
+            assert [p.name for p in Path(tmpdir).iterdir()] == ["tasks.json"]
             assert parsed_tasks[1]["dependencies"] == ["task_001"]
 
+    def test_update_tasks_json_file_skips_unchanged_content(self, tmp_path):
+        """Test that rewriting identical tasks does not touch tasks.json again."""
+        tasks = [{"id": "task_001", "title": "Task 1", "status": "pending"}]
+
+        with patch('src.tools.file_ops.get_settings') as mock_settings, \
+                patch('src.tools.file_ops._replace_file', side_effect=_replace_file) as mock_replace:
+            mock_settings.return_value.get_session_workspace.return_value = tmp_path
+            update_tasks_json_file("test_session", tasks)
+            update_tasks_json_file("test_session", tasks)
+            assert mock_replace.call_count == 1
+
+            tasks[0]["status"] = "completed"
+            update_tasks_json_file("test_session", tasks)
+            assert mock_replace.call_count == 2
+
+        assert parse_tasks_json(tmp_path / "tasks.json")[0]["status"] == "completed"
+
+    def test_update_tasks_json_file_after_write_tasks_json(self, tmp_path):
+        """Test that a write_tasks_json rewrite is not mistaken for unchanged content."""
+        coder_tasks = [{"id": "task_001", "title": "Task 1", "status": "completed"}]
+        architect_tasks = [{"id": "task_001", "title": "Task 1", "status": "pending"}]
+
+        with patch('src.tools.file_ops.get_settings') as mock_settings:
+            mock_settings.return_value.get_session_workspace.return_value = tmp_path
+            update_tasks_json_file("test_session", coder_tasks)
+            write_tasks_json(tmp_path / "tasks.json", architect_tasks)
+            update_tasks_json_file("test_session", coder_tasks)
+
+        assert parse_tasks_json(tmp_path / "tasks.json")[0]["status"] == "completed"
+
     def test_get_task_by_id(self):
         """Test finding a task by ID."""
         tasks = [
@@ -160,3 +242,41 @@ More details here.
         ready = get_ready_tasks(tasks, ["task_001", "task_002"])
         assert len(ready) == 1
         assert ready[0]["id"] == "task_003"
+
+    def test_task_scheduler_releases_successors(self):
+        """Test that completing a task releases only the successors it unblocks."""
+        tasks = [
+            {"id": "task_001", "dependencies": []},
+            {"id": "task_002", "dependencies": []},
+            {"id": "task_003", "dependencies": ["task_001", "task_002"]},
+            {"id": "task_004", "dependencies": ["task_999"]},
+        ]
+        scheduler = TaskScheduler(TaskTable(tasks), [])
+
+        assert scheduler.ready_ids() == ["task_001", "task_002"]
+        assert scheduler.complete("task_001") == []
+        assert scheduler.complete("task_002") == ["task_003"]
+        assert scheduler.ready_ids() == ["task_003"]
+        assert scheduler.complete("task_002") == []
+
+    def test_submit_write(self):
+        """Test background writes are complete after waiting."""
+        with TemporaryDirectory() as tmpdir:
+            file_path = Path(tmpdir) / "Design.md"
+            submit_write(write_file, file_path, "# Design")
+
+            assert wait_for_pending_writes() == []
+
+            assert read_file(file_path) == "# Design"
+
+    def test_wait_for_pending_writes_reports_failures(self):
+        """Test that a failed background write is returned once to the waiter."""
+        with TemporaryDirectory() as tmpdir:
+            file_path = Path(tmpdir) / "tasks.json"
+            submit_write(write_tasks_json, file_path, [{"title": "No id"}])
+
+            errors = wait_for_pending_writes()
+
+            assert len(errors) == 1
+            assert str(file_path) in errors[0]
+            assert wait_for_pending_writes() == []
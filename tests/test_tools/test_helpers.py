@@ -1,5 +1,6 @@
 """Unit tests for helper functions."""
 
+import asyncio
 import pytest
 from datetime import datetime
 
@@ -14,6 +15,7 @@ from src.utils.helpers import (
     merge_dicts,
     format_timestamp,
     chunk_list,
+    gather_with_concurrency,
 )
 
 
@@ -165,3 +167,21 @@ function hello() {
         chunks = chunk_list(items, 3)
         assert len(chunks) == 3
         assert all(len(chunk) == 3 for chunk in chunks)
+
+    def test_gather_with_concurrency(self):
+        """Test bounded concurrent gathering keeps order and limit."""
+        running = 0
+        peak = 0
+
+        async def work(value):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return value * 2
+
+        results = asyncio.run(gather_with_concurrency(2, *(work(i) for i in range(5))))
+
+        assert results == [0, 2, 4, 6, 8]
+        assert peak == 2
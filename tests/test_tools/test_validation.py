@@ -1,12 +1,14 @@
 """Unit tests for validation functions."""
 
 import pytest
+from unittest.mock import patch
 
 from src.tools.validation import (
     validate_prd,
     validate_design,
     validate_tasks,
     validate_tasks_json,
+    detect_task_cycles,
     validate_coding_output,
     validate_requirement,
     OutputValidator,
@@ -72,6 +74,27 @@ As a user, I want to view my dashboard so that I can track my progress and activ
         assert len(errors) > 0
         assert any("overview" in e.lower() for e in errors)
 
+    def test_validate_prd_repeat_uses_cached_result(self):
+        """Test that re-validating the same PRD reuses the cached errors."""
+        prd = "# Title\n\nSome content for the cache test."
+        _, first = validate_prd(prd)
+        first.append("caller mutation")
+
+        with patch("src.tools.validation._prd_errors") as mock_check:
+            is_valid, errors = validate_prd(prd)
+
+        mock_check.assert_not_called()
+        assert is_valid is False
+        assert "caller mutation" not in errors
+
+    def test_validate_prd_user_story_needs_full_form(self):
+        """Test that user stories must contain all three clauses."""
+        _, errors = validate_prd("As a user I want to add todos.")
+        assert any("user stories found" in e for e in errors)
+
+        _, errors = validate_prd("As a user I want to add todos so that I remember them.")
+        assert not any("user stories found" in e for e in errors)
+
     def test_validate_design_valid(self):
         """Test validating a valid design document."""
         design = """
@@ -199,6 +222,10 @@ This comprehensive testing approach ensures high code quality and system stabili
         assert tasks is not None
         assert len(tasks) == 1
 
+        is_valid, errors, tasks = validate_tasks_json(tasks_json.encode())
+        assert is_valid is True
+        assert tasks[0]["id"] == "task_001"
+
     def test_validate_tasks_json_invalid_json(self):
         """Test validating invalid JSON."""
         tasks_json = "{ invalid json }"
@@ -206,6 +233,28 @@ This comprehensive testing approach ensures high code quality and system stabili
         assert is_valid is False
         assert tasks is None
 
+    def test_detect_task_cycles(self):
+        """Test dependency cycle detection."""
+        tasks = [
+            {"id": "task_001", "dependencies": ["task_003"]},
+            {"id": "task_002", "dependencies": ["task_001"]},
+            {"id": "task_003", "dependencies": ["task_002"]},
+            {"id": "task_004", "dependencies": []},
+        ]
+        assert detect_task_cycles(tasks) == ["task_001", "task_003", "task_002", "task_001"]
+
+        tasks[0]["dependencies"] = ["task_004", "task_999"]
+        assert detect_task_cycles(tasks) is None
+
+    def test_detect_task_cycles_ignores_non_string_dependencies(self):
+        """Test that null or unhashable dependencies neither hide a cycle nor raise."""
+        tasks = [
+            {"id": "task_001", "dependencies": [None, "task_002"]},
+            {"id": "task_002", "dependencies": [{"id": "task_003"}, ["x"], "task_001"]},
+            {"id": "task_003", "dependencies": 5},
+        ]
+        assert detect_task_cycles(tasks) == ["task_001", "task_002", "task_001"]
+
     def test_validate_coding_output_success(self):
         """Test validating successful coding output."""
         output = "Created file: main.py\nImplementation complete."
@@ -218,6 +267,16 @@ This comprehensive testing approach ensures high code quality and system stabili
         is_success, message = validate_coding_output(output)
         assert is_success is False
 
+    def test_validate_coding_output_names_matched_pattern(self):
+        """Test that failure messages name the pattern that matched."""
+        is_success, message = validate_coding_output("bash: pytest: command not found")
+        assert is_success is False
+        assert message == "Critical error detected: 'command not found'"
+
+        is_success, message = validate_coding_output("Traceback (most recent call last):", mode="strict")
+        assert is_success is False
+        assert message == "Failure pattern detected: '^traceback'"
+
     def test_validate_requirement_valid(self):
         """Test validating a valid requirement."""
         requirement = "Build a todo app with add, list, and delete features"
@@ -0,0 +1,58 @@
+"""Unit tests for the tasks.json write batcher."""
+
+import threading
+from unittest.mock import patch
+
+from src.tools.write_batcher import WriteBatcher
+
+
+@patch('src.tools.write_batcher.update_tasks_json_file')
+def test_write_batcher_coalesces_updates(mock_update):
+    """Test that only the latest pending task list is written."""
+    batcher = WriteBatcher(flush_interval_ms=10_000)
+    first = [{"id": "task_001", "status": "pending"}]
+    latest = [{"id": "task_001", "status": "completed"}]
+
+    batcher.enqueue("session", first)
+    batcher.enqueue("session", latest)
+    assert not mock_update.called
+
+    batcher.flush()
+    mock_update.assert_called_once_with("session", latest)
+
+
+@patch('src.tools.write_batcher.update_tasks_json_file')
+def test_write_batcher_sync(mock_update):
+    """Test that sync enqueue writes immediately."""
+    batcher = WriteBatcher()
+    tasks = [{"id": "task_001", "status": "completed"}]
+
+    batcher.enqueue("session", tasks, sync=True)
+
+    mock_update.assert_called_once_with("session", tasks)
+
+
+@patch('src.tools.write_batcher.update_tasks_json_file')
+def test_write_batcher_overlapping_flushes_keep_order(mock_update):
+    """Test that a flush started mid-write cannot overtake the older write."""
+    batcher = WriteBatcher(flush_interval_ms=10_000)
+    older = [{"id": "task_001", "status": "in_progress"}]
+    newer = [{"id": "task_001", "status": "completed"}]
+    written = []
+    threads = []
+
+    def write(session_id, task_list):
+        if not threads:
+            # A sync flush of a newer list arrives while this write is in progress
+            thread = threading.Thread(target=batcher.enqueue, args=("session", newer, True))
+            threads.append(thread)
+            thread.start()
+            thread.join(timeout=0.2)
+        written.append(task_list)
+
+    mock_update.side_effect = write
+    batcher.enqueue("session", older)
+    batcher.flush()
+    threads[0].join()
+
+    assert written == [older, newer]